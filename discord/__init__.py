@@ -13,6 +13,8 @@ from .voice import VoiceManager
 from .achievement import AchievementManager
 from .enum import Result, LogLevel, CreateFlags
 from .exception import getException
+from .pump import CallbackPump, PumpStats
+from .threadsafe import ThreadSafeDiscord
 from typing import Callable
 import ctypes
     
@@ -34,6 +36,8 @@ class Discord:
         self._achievementManager = AchievementManager()
         
         self._garbage = []
+        self._pump = None
+        self._threadSafe = None
         
         version = sdk.DiscordVersion(3)
         
@@ -64,6 +68,13 @@ class Discord:
         self.core = pointer.contents
         
     def __del__(self):
+        if self._pump:
+            try:
+                self._pump.Stop()
+            except Exception:
+                # nobody is left to report the pump's error to, the core is destroyed anyway
+                pass
+                
         if self.core:
             self.core.destroy(self.core)
             self.core = None
@@ -84,11 +95,65 @@ class Discord:
     def RunCallbacks(self) -> None:
         """
         Runs all pending SDK callbacks.
+        
+        Flushes the network manager when message batching is enabled.
         """
         result = Result(self.core.run_callbacks(self.core))
         if result != Result.Ok:
             raise getException(result)
             
+        if self._imageManager._completed:
+            self._imageManager._RunCompleted()
+            
+        if self._networkManager._batches is not None:
+            self._networkManager.Flush()
+            
+    def StartPump(self, minHz: float = 1, maxHz: float = 60) -> CallbackPump:
+        """
+        Starts a background thread calling RunCallbacks, between minHz and maxHz times per second.
+        
+        The rate goes up while callbacks and events are flowing, and backs off when idle.
+        Manager methods must not be called from other threads while the pump is running, use GetThreadSafe() instead.
+        If the previous pump was stopped by an exception, it is raised, and the next call starts a new pump.
+        """
+        if self._pump and not self._pump.IsRunning():
+            self.StopPump()
+            
+        if not self._pump:
+            self._pump = CallbackPump(self, minHz, maxHz)
+            self._pump.Start()
+            
+        return self._pump
+        
+    def StopPump(self) -> None:
+        """
+        Stops the background callback thread, if any.
+        """
+        if self._pump:
+            pump, self._pump = self._pump, None
+            pump.Stop()
+            
+    def GetPumpStats(self) -> PumpStats:
+        """
+        Returns the tick statistics measured by the background callback thread.
+        """
+        if not self._pump:
+            return PumpStats()
+            
+        return self._pump.GetStats()
+        
+    def GetThreadSafe(self) -> ThreadSafeDiscord:
+        """
+        Returns a facade whose manager methods can be called from any thread.
+        
+        Calls are queued onto the callback pump (started with default rates if needed) and return futures.
+        """
+        self.StartPump()
+        if not self._threadSafe or self._threadSafe._pump is not self._pump:
+            self._threadSafe = ThreadSafeDiscord(self, self._pump)
+            
+        return self._threadSafe
+            
     def GetActivityManager(self) -> ActivityManager:
         """
         Fetches an instance of the manager for interfacing with activies in the SDK.
@@ -3,19 +3,32 @@ from .enum import Result
 from .model import UserAchievement
 from .event import bindEvents
 from .exception import getException
+from .callback import bindCallback
+from .arrays import collect
 from typing import Callable
 import ctypes
 
 class AchievementManager:
     def __init__(self):
         self._internal = None
-        self._garbage = []
+        self._views = False
         self._events = bindEvents(sdk.IDiscordAchievementEvents,
             self._OnUserAchievementUpdate
         )
         
     def _OnUserAchievementUpdate(self, event_data, user_achievement):
-        self.OnUserAchievementUpdate(UserAchievement(copy = user_achievement.contents))
+        if self._views:
+            self.OnUserAchievementUpdate(UserAchievement(internal = user_achievement.contents))
+        else:
+            self.OnUserAchievementUpdate(UserAchievement(copy = user_achievement.contents))
+        
+    def SetEventViews(self, enabled: bool) -> None:
+        """
+        Makes OnUserAchievementUpdate receive models backed by the SDK's memory instead of copies.
+        
+        They are only valid until the handler returns: call Detach() on them to keep them.
+        """
+        self._views = enabled
         
     def SetUserAchievement(self, achievementId: int, percentComplete: int, callback: Callable[[Result], None]) -> None:
         """
@@ -23,15 +36,13 @@ class AchievementManager:
         
         Returns discord.enum.Result via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.set_user_achievement.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.set_user_achievement.argtypes[-1], CCallback)
         
-        self._internal.set_user_achievement(self._internal, achievementId, percentComplete, ctypes.c_void_p(), CCallback)
+        self._internal.set_user_achievement(self._internal, achievementId, percentComplete, callbackData, CCallback)
         
     def FetchUserAchievements(self, callback: Callable[[Result], None]) -> None:
         """
@@ -39,15 +50,13 @@ class AchievementManager:
         
         Returns discord.enum.Result via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.fetch_user_achievements.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.fetch_user_achievements.argtypes[-1], CCallback)
         
-        self._internal.fetch_user_achievements(self._internal, ctypes.c_void_p(), CCallback)
+        self._internal.fetch_user_achievements(self._internal, callbackData, CCallback)
         
     def CountUserAchievements(self) -> int:
         """
@@ -68,6 +77,49 @@ class AchievementManager:
             
         return UserAchievement(internal = achievement)
         
+    def IterUserAchievements(self):
+        """
+        Iterates over the user achievements readied by FetchUserAchievements().
+        
+        One model is reused for every item, it changes on the next step: call Detach() on it to keep it.
+        """
+        internal = self._internal
+        getAt = internal.get_user_achievement_at
+        record = sdk.DiscordUserAchievement()
+        model = UserAchievement(internal = record)
+        for index in range(self.CountUserAchievements()):
+            result = getAt(internal, index, record)
+            if result != Result.Ok:
+                raise getException(Result(result))
+                
+            model._Invalidate()
+            yield model
+            
+    def AllUserAchievements(self) -> list:
+        """
+        Returns the user achievements readied by FetchUserAchievements(), read into a single array.
+        """
+        internal = self._internal
+        getAt = internal.get_user_achievement_at
+        records = (sdk.DiscordUserAchievement * self.CountUserAchievements())()
+        for index in range(len(records)):
+            result = getAt(internal, index, records[index])
+            if result != Result.Ok:
+                raise getException(Result(result))
+                
+        return [UserAchievement(internal = record) for record in records]
+        
+    def ToArray(self) -> "numpy.ndarray":
+        """
+        Returns the user achievements readied by FetchUserAchievements() as a NumPy structured array (requires numpy).
+        """
+        def fill(index, record):
+            result = Result(self._internal.get_user_achievement_at(self._internal, index, record))
+            if result != Result.Ok:
+                raise getException(result)
+                
+        return collect(sdk.DiscordUserAchievement, self.CountUserAchievements(), fill)
+        
     def GetUserAchievement(self, achievementId: int) -> None:
         """
         Gets the user achievement for the given achievement id. 
@@ -2,13 +2,13 @@ from . import sdk
 from .model import User, Activity
 from .event import bindEvents
 from .enum import Result, ActivityJoinRequestReply, ActivityActionType
+from .callback import bindCallback
 from typing import Callable
-import ctypes
 
 class ActivityManager:
     def __init__(self):
         self._internal = None
-        self._garbage = []
+        self._views = False
         self._events = bindEvents(sdk.IDiscordActivityEvents,
             self._OnActivityJoin,
             self._OnActivitySpectate,
@@ -23,10 +23,24 @@ class ActivityManager:
         self.OnActivitySpectate(secret.decode("utf8"))
         
     def _OnActivityJoinRequest(self, event_data, user):
-        self.OnActivityJoinRequest(User(copy = user.contents))
+        if self._views:
+            self.OnActivityJoinRequest(User(internal = user.contents))
+        else:
+            self.OnActivityJoinRequest(User(copy = user.contents))
         
     def _OnActivityInvite(self, event_data, type, user, activity):
-        self.OnActivityInvite(type, User(copy = user.contents), Activity(copy = activity.contents))
+        if self._views:
+            self.OnActivityInvite(type, User(internal = user.contents), Activity(internal = activity.contents))
+        else:
+            self.OnActivityInvite(type, User(copy = user.contents), Activity(copy = activity.contents))
+        
+    def SetEventViews(self, enabled: bool) -> None:
+        """
+        Makes OnActivityJoinRequest and OnActivityInvite receive models backed by the SDK's memory instead of copies.
+        
+        They are only valid until the handler returns: call Detach() on them to keep them.
+        """
+        self._views = enabled
         
     def RegisterCommand(self, command: str) -> Result:
         """
@@ -48,15 +62,13 @@ class ActivityManager:
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.update_activity.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.update_activity.argtypes[-1], CCallback)
         
-        self._internal.update_activity(self._internal, activity._internal, ctypes.c_void_p(), CCallback)
+        self._internal.update_activity(self._internal, activity._internal, callbackData, CCallback)
         
     def ClearActivity(self, callback: Callable[[Result], None]) -> None:
         """
@@ -64,15 +76,13 @@ class ActivityManager:
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.clear_activity.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.clear_activity.argtypes[-1], CCallback)
         
-        self._internal.clear_activity(self._internal, ctypes.c_void_p(), CCallback)
+        self._internal.clear_activity(self._internal, callbackData, CCallback)
         
     def SendRequestReply(self, userId: int, reply: ActivityJoinRequestReply, callback: Callable[[Result], None]) -> None:
         """
@@ -80,15 +90,13 @@ class ActivityManager:
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.send_request_reply.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.send_request_reply.argtypes[-1], CCallback)
         
-        self._internal.send_request_reply(self._internal, userId, reply, ctypes.c_void_p(), CCallback)
+        self._internal.send_request_reply(self._internal, userId, reply, callbackData, CCallback)
         
     def SendInvite(self, userId: int, type: ActivityActionType, content: str, callback: Callable[[Result], None]) -> None:
         """
@@ -96,15 +104,13 @@ class ActivityManager:
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.send_invite.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.send_invite.argtypes[-1], CCallback)
         
-        self._internal.send_invite(self._internal, userId, type, content.encode("utf8"), ctypes.c_void_p(), CCallback)
+        self._internal.send_invite(self._internal, userId, type, content.encode("utf8"), callbackData, CCallback)
         
     def AcceptInvite(self, userId: int, callback: Callable[[Result], None]) -> None:
         """
@@ -112,15 +118,13 @@ class ActivityManager:
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.accept_invite.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.accept_invite.argtypes[-1], CCallback)
         
-        self._internal.accept_invite(self._internal, userId, ctypes.c_void_p(), CCallback)
+        self._internal.accept_invite(self._internal, userId, callbackData, CCallback)
         
     def OnActivityJoin(self, joinSecret: str) -> None:
         """
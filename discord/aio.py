@@ -0,0 +1,348 @@
+from . import Discord
+from .model import Activity, ImageHandle, InputMode
+from .lobby import LobbyTransaction, LobbyMemberTransaction, LobbySearchQuery
+from .enum import Result, ActivityJoinRequestReply, ActivityActionType
+from .exception import getException
+from .callback import callWithErrors
+import asyncio
+
+class AsyncManager:
+    def __init__(self, manager):
+        self._manager = manager
+    
+    def __getattr__(self, key):
+        # synchronous methods and events are forwarded to the wrapped manager
+        return getattr(self._manager, key)
+    
+    def __setattr__(self, key, value):
+        # event handlers (OnLobbyMessage...) are set on the wrapped manager
+        if key == "_manager":
+            object.__setattr__(self, key, value)
+        else:
+            setattr(self._manager, key, value)
+    
+    def _call(self, method, *args) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        
+        def callback(result, *value):
+            if future.done():
+                return
+            
+            result = Result(result)
+            if result != Result.Ok:
+                future.set_exception(getException(result))
+            else:
+                future.set_result(value[0] if value else None)
+        
+        def fail(exception):
+            # raised while the callback ran: the future would never resolve otherwise
+            if not future.done():
+                future.set_exception(exception)
+        
+        callWithErrors(fail, method, *args, callback)
+        return future
+
+class AsyncActivityManager(AsyncManager):
+    def update_activity(self, activity: Activity) -> asyncio.Future:
+        """
+        Set a user's presence in Discord to a new activity.
+        """
+        return self._call(self._manager.UpdateActivity, activity)
+    
+    def clear_activity(self) -> asyncio.Future:
+        """
+        Clears a user's presence in Discord to make it show nothing.
+        """
+        return self._call(self._manager.ClearActivity)
+    
+    def send_request_reply(self, userId: int, reply: ActivityJoinRequestReply) -> asyncio.Future:
+        """
+        Sends a reply to an Ask to Join request.
+        """
+        return self._call(self._manager.SendRequestReply, userId, reply)
+    
+    def send_invite(self, userId: int, type: ActivityActionType, content: str) -> asyncio.Future:
+        """
+        Sends a game invite to a given user.
+        """
+        return self._call(self._manager.SendInvite, userId, type, content)
+    
+    def accept_invite(self, userId: int) -> asyncio.Future:
+        """
+        Accepts a game invitation from a given userId.
+        """
+        return self._call(self._manager.AcceptInvite, userId)
+
+class AsyncApplicationManager(AsyncManager):
+    def validate_or_exit(self) -> asyncio.Future:
+        """
+        Checks if the current user has the entitlement to run this game.
+        """
+        return self._call(self._manager.ValidateOrExit)
+    
+    def get_oauth2_token(self) -> asyncio.Future:
+        """
+        Retrieve an oauth2 bearer token for the current user.
+        
+        Resolves to an OAuth2Token.
+        """
+        return self._call(self._manager.GetOAuth2Token)
+    
+    def get_ticket(self) -> asyncio.Future:
+        """
+        Get the signed app ticket for the current user.
+        
+        Resolves to a str.
+        """
+        return self._call(self._manager.GetTicket)
+
+class AsyncImageManager(AsyncManager):
+    def fetch(self, handle: ImageHandle, refresh: bool = False) -> asyncio.Future:
+        """
+        Prepares an image to later retrieve data about it.
+        
+        Resolves to an ImageHandle.
+        """
+        return self._call(self._manager.Fetch, handle, refresh)
+    
+    def fetch_many(self, handles: list, refresh: bool = False, maxInFlight: int = 8) -> asyncio.Future:
+        """
+        Fetches many images, with at most maxInFlight requests running at once.
+        
+        Resolves to a list of (Result, ImageHandle) pairs, in the order of handles.
+        """
+        future = asyncio.get_running_loop().create_future()
+        
+        def callback(results):
+            if not future.done():
+                future.set_result(results)
+                
+        self._manager.FetchMany(handles, refresh, callback, maxInFlight)
+        return future
+
+class AsyncLobbyManager(AsyncManager):
+    def create_lobby(self, transaction: LobbyTransaction) -> asyncio.Future:
+        """
+        Creates a lobby.
+        
+        Resolves to a Lobby.
+        """
+        return self._call(self._manager.CreateLobby, transaction)
+    
+    def update_lobby(self, lobbyId: int, transaction: LobbyTransaction) -> asyncio.Future:
+        """
+        Updates a lobby with data from the given transaction.
+        """
+        return self._call(self._manager.UpdateLobby, lobbyId, transaction)
+    
+    def delete_lobby(self, lobbyId: int) -> asyncio.Future:
+        """
+        Deletes a given lobby.
+        """
+        return self._call(self._manager.DeleteLobby, lobbyId)
+    
+    def connect_lobby(self, lobbyId: int, lobbySecret: str) -> asyncio.Future:
+        """
+        Connects the current user to a given lobby.
+        
+        Resolves to a Lobby.
+        """
+        return self._call(self._manager.ConnectLobby, lobbyId, lobbySecret)
+    
+    def connect_lobby_with_activity_secret(self, activitySecret: str) -> asyncio.Future:
+        """
+        Connects the current user to a lobby using the special activity secret from the lobby.
+        
+        Resolves to a Lobby.
+        """
+        return self._call(self._manager.ConnectLobbyWithActivitySecret, activitySecret)
+    
+    def disconnect_lobby(self, lobbyId: int) -> asyncio.Future:
+        """
+        Disconnects the current user from a lobby.
+        """
+        return self._call(self._manager.DisconnectLobby, lobbyId)
+    
+    def update_member(self, lobbyId: int, userId: int, transaction: LobbyMemberTransaction) -> asyncio.Future:
+        """
+        Updates lobby member info for a given member of the lobby.
+        """
+        return self._call(self._manager.UpdateMember, lobbyId, userId, transaction)
+    
+    def send_lobby_message(self, lobbyId: int, data: str) -> asyncio.Future:
+        """
+        Sends a message to the lobby on behalf of the current user.
+        """
+        return self._call(self._manager.SendLobbyMessage, lobbyId, data)
+    
+    def search(self, search: LobbySearchQuery) -> asyncio.Future:
+        """
+        Searches available lobbies based on the search criteria chosen in the LobbySearchQuery member functions.
+        """
+        return self._call(self._manager.Search, search)
+    
+    def connect_voice(self, lobbyId: int) -> asyncio.Future:
+        """
+        Connects to the voice channel of the current lobby.
+        """
+        return self._call(self._manager.ConnectVoice, lobbyId)
+    
+    def disconnect_voice(self, lobbyId: int) -> asyncio.Future:
+        """
+        Disconnects from the voice channel of a given lobby.
+        """
+        return self._call(self._manager.DisconnectVoice, lobbyId)
+
+class AsyncOverlayManager(AsyncManager):
+    def set_locked(self, locked: bool) -> asyncio.Future:
+        """
+        Locks or unlocks input in the overlay.
+        """
+        return self._call(self._manager.SetLocked, locked)
+    
+    def open_activity_invite(self, type: ActivityActionType) -> asyncio.Future:
+        """
+        Opens the overlay modal for sending game invitations to users, channels, and servers.
+        """
+        return self._call(self._manager.OpenActivityInvite, type)
+    
+    def open_guild_invite(self, code: str) -> asyncio.Future:
+        """
+        Opens the overlay modal for joining a Discord guild, given its invite code.
+        """
+        return self._call(self._manager.OpenGuildInvite, code)
+    
+    def open_voice_settings(self) -> asyncio.Future:
+        """
+        Opens the overlay widget for voice settings for the currently connected application.
+        """
+        return self._call(self._manager.OpenVoiceSettings)
+
+class AsyncStorageManager(AsyncManager):
+    def read_async(self, name: str) -> asyncio.Future:
+        """
+        Reads data asynchronously from the game's allocated save file.
+        
+        Resolves to bytes.
+        """
+        return self._call(self._manager.ReadAsync, name)
+    
+    def read_async_partial(self, name: str, offset: int, length: int) -> asyncio.Future:
+        """
+        Reads data asynchronously from the game's allocated save file, starting at a given offset and up to a given length.
+        
+        Resolves to bytes.
+        """
+        return self._call(self._manager.ReadAsyncPartial, name, offset, length)
+    
+    def write_async(self, name: str, data: bytes) -> asyncio.Future:
+        """
+        Writes data asynchronously to disk under the given keyname.
+        """
+        return self._call(self._manager.WriteAsync, name, data)
+
+class AsyncStoreManager(AsyncManager):
+    def fetch_skus(self) -> asyncio.Future:
+        """
+        Fetches the list of SKUs for the connected application, readying them for iteration.
+        """
+        return self._call(self._manager.FetchSkus)
+    
+    def fetch_entitlements(self) -> asyncio.Future:
+        """
+        Fetches a list of entitlements to which the user is entitled.
+        """
+        return self._call(self._manager.FetchEntitlements)
+    
+    def start_purchase(self, skuId: int) -> asyncio.Future:
+        """
+        Opens the overlay to begin the in-app purchase dialogue for the given SKU ID.
+        """
+        return self._call(self._manager.StartPurchase, skuId)
+
+class AsyncUserManager(AsyncManager):
+    def get_user(self, userId: int) -> asyncio.Future:
+        """
+        Get user information for a given id.
+        
+        Resolves to a User.
+        """
+        return self._call(self._manager.GetUser, userId)
+
+class AsyncVoiceManager(AsyncManager):
+    def set_input_mode(self, inputMode: InputMode) -> asyncio.Future:
+        """
+        Sets a new voice input mode for the user.
+        """
+        return self._call(self._manager.SetInputMode, inputMode)
+
+class AsyncAchievementManager(AsyncManager):
+    def set_user_achievement(self, achievementId: int, percentComplete: int) -> asyncio.Future:
+        """
+        Updates the current user's status for a given achievement.
+        """
+        return self._call(self._manager.SetUserAchievement, achievementId, percentComplete)
+    
+    def fetch_user_achievements(self) -> asyncio.Future:
+        """
+        Loads a stable list of the current user's achievements to iterate over.
+        """
+        return self._call(self._manager.FetchUserAchievements)
+
+class AsyncDiscord:
+    """
+    asyncio front-end for a Discord instance.
+    
+    Every callback-based method is exposed as an awaitable; a failed Result
+    raises the matching exception from discord.exception.
+    """
+    def __init__(self, discord: Discord, rate: float = 60):
+        self.discord = discord
+        self.rate = rate
+        self._task = None
+        
+        self.activities = AsyncActivityManager(discord.GetActivityManager())
+        self.applications = AsyncApplicationManager(discord.GetApplicationManager())
+        self.images = AsyncImageManager(discord.GetImageManager())
+        self.lobbies = AsyncLobbyManager(discord.GetLobbyManager())
+        self.overlay = AsyncOverlayManager(discord.GetOverlayManager())
+        self.storage = AsyncStorageManager(discord.GetStorageManager())
+        self.store = AsyncStoreManager(discord.GetStoreManager())
+        self.users = AsyncUserManager(discord.GetUserManager())
+        self.voice = AsyncVoiceManager(discord.GetVoiceManager())
+        self.achievements = AsyncAchievementManager(discord.GetAchievementManager())
+    
+    async def __aenter__(self):
+        self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+    
+    async def _pump(self):
+        while True:
+            self.discord.RunCallbacks()
+            await asyncio.sleep(1 / self.rate)
+    
+    def start(self) -> asyncio.Task:
+        """
+        Starts the task running Discord.RunCallbacks on the current event loop, `rate` times per second.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._pump())
+        
+        return self._task
+    
+    async def stop(self) -> None:
+        """
+        Stops the callback task. Raises the exception that ended it, if any.
+        """
+        task, self._task = self._task, None
+        if task is None:
+            return
+        
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
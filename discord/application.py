@@ -1,8 +1,8 @@
 from . import sdk
 from .model import OAuth2Token
 from .enum import Result
+from .callback import bindCallback
 from typing import Callable, Optional
-import ctypes
 
 class SignedAppTicket:
     def __init__(self):
@@ -14,7 +14,6 @@ class SignedAppTicket:
 class ApplicationManager:
     def __init__(self):
         self._internal = None
-        self._garbage = []
         self._events = None
         
     def GetCurrentLocale(self) -> str:
@@ -39,17 +38,15 @@ class ApplicationManager:
         
         Returns discord.enum.Result (int) and OAuth2Token (str) via callback.
         """
-        def CCallback(callback_data, result, oauth2_token):
-            self._garbage.remove(CCallback)
+        def CCallback(result, oauth2_token):
             if result == Result.Ok:
                 callback(result, OAuth2Token(copy = oauth2_token.contents))
             else:
                 callback(result, None)
             
-        CCallback = self._internal.get_oauth2_token.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.get_oauth2_token.argtypes[-1], CCallback)
         
-        self._internal.get_oauth2_token(self._internal, ctypes.c_void_p(), CCallback)
+        self._internal.get_oauth2_token(self._internal, callbackData, CCallback)
         
     def ValidateOrExit(self, callback: Callable[[Result], None]) -> None:
         """
@@ -57,14 +54,12 @@ class ApplicationManager:
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             callback(result)
             
-        CCallback = self._internal.validate_or_exit.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.validate_or_exit.argtypes[-1], CCallback)
         
-        self._internal.validate_or_exit(self._internal, ctypes.c_void_p(), CCallback)
+        self._internal.validate_or_exit(self._internal, callbackData, CCallback)
         
     def GetTicket(self, callback: Callable[[Result, Optional[str]], None]) -> None:
         """
@@ -72,14 +67,12 @@ class ApplicationManager:
         
         Returns discord.Enum.Result (int) and str via callback.
         """
-        def CCallback(callback_data, result, data):
-            self._garbage.remove(CCallback)
+        def CCallback(result, data):
             if result == Result.Ok:
-                callback(result, data.contents.value.decode("utf8"))
+                callback(result, data.decode("utf8"))
             else:
                 callback(result, None)
             
-        CCallback = self._internal.get_ticket.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.get_ticket.argtypes[-1], CCallback)
         
-        self._internal.get_ticket(self._internal, ctypes.c_void_p(), CCallback)
\ No newline at end of file
+        self._internal.get_ticket(self._internal, callbackData, CCallback)
\ No newline at end of file
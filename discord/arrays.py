@@ -0,0 +1,66 @@
+"""
+Exports of SDK records into NumPy structured arrays.
+
+NumPy is optional: it is only imported when an array is built.
+"""
+import ctypes
+
+_dtypes = {}
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("exporting to arrays requires numpy") from None
+    
+    return numpy
+
+def structDtype(ctype):
+    """
+    Returns the NumPy dtype matching the layout of a ctypes type: strings are bytes (S) fields, nested structures are nested dtypes.
+    """
+    dtype = _dtypes.get(ctype)
+    if dtype is not None:
+        return dtype
+    
+    numpy = _numpy()
+    if issubclass(ctype, ctypes.Structure):
+        names, formats, offsets = [], [], []
+        for field in ctype._fields_:
+            names.append(field[0])
+            formats.append(structDtype(field[1]))
+            offsets.append(getattr(ctype, field[0]).offset)
+        
+        dtype = numpy.dtype({
+            "names": names,
+            "formats": formats,
+            "offsets": offsets,
+            "itemsize": ctypes.sizeof(ctype)
+        })
+    elif issubclass(ctype, ctypes.Array):
+        if ctype._type_ is ctypes.c_char:
+            dtype = numpy.dtype(("S", ctype._length_))
+        else:
+            dtype = numpy.dtype((structDtype(ctype._type_), (ctype._length_,)))
+    else:
+        dtype = numpy.dtype(ctype)
+    
+    _dtypes[ctype] = dtype
+    return dtype
+
+def collect(ctype, count: int, fill):
+    """
+    Builds a structured array of count records, in a single buffer.
+    
+    fill(index, record) is called for every record, with a struct viewing its slot in the buffer.
+    """
+    numpy = _numpy()
+    dtype = structDtype(ctype)
+    if count <= 0:
+        return numpy.empty(0, dtype = dtype)
+    
+    buffer = (ctype * count)()
+    for index in range(count):
+        fill(index, buffer[index])
+    
+    return numpy.frombuffer(buffer, dtype = dtype)
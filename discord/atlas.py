@@ -0,0 +1,173 @@
+"""
+Packing of avatars into a single texture.
+
+Requires numpy, imported when an atlas is created.
+"""
+from .image import ImageManager, _imageKey
+from .model import ImageHandle
+from .arrays import _numpy
+from collections import OrderedDict
+from typing import Optional
+
+class AvatarAtlas:
+    """
+    Fixed-size RGBA texture (a (height, width, 4) uint8 NumPy array) holding many avatars.
+    
+    Avatars are packed on shelves, rows as tall as their tallest image, and the least recently used
+    are evicted when the atlas is full. The regions written since the last TakeDirty are reported,
+    so only those need uploading.
+    """
+    def __init__(self, imageManager: ImageManager, width: int = 1024, height: int = 1024):
+        numpy = _numpy()
+        self.width = width
+        self.height = height
+        self.pixels = numpy.zeros((height, width, 4), dtype = numpy.uint8)
+        self._numpy = numpy
+        self._imageManager = imageManager
+        self._slots = OrderedDict()
+        self._shelves = []
+        self._dirty = []
+    
+    def _Allocate(self, width: int, height: int) -> Optional[tuple]:
+        # best fit on height, among the shelves with a free span wide enough
+        best = None
+        for shelf in self._shelves:
+            if shelf[1] < height or (best is not None and shelf[1] >= best[1]):
+                continue
+            
+            for span in shelf[2]:
+                if span[1] >= width:
+                    best = shelf
+                    break
+        
+        if best is None:
+            top = self._shelves[-1][0] + self._shelves[-1][1] if self._shelves else 0
+            if top + height > self.height or width > self.width:
+                return None
+            
+            best = [top, height, [[0, self.width]]]
+            self._shelves.append(best)
+        
+        spans = best[2]
+        for index, span in enumerate(spans):
+            if span[1] >= width:
+                x = span[0]
+                span[0] += width
+                span[1] -= width
+                if span[1] == 0:
+                    del spans[index]
+                
+                return (x, best[0], width, height)
+    
+    def _Free(self, slot: tuple) -> None:
+        x, y, width, _ = slot
+        for shelf in self._shelves:
+            if shelf[0] == y:
+                break
+        
+        spans = shelf[2]
+        spans.append([x, width])
+        spans.sort()
+        
+        merged = [spans[0]]
+        for span in spans[1:]:
+            if merged[-1][0] + merged[-1][1] == span[0]:
+                merged[-1][1] += span[1]
+            else:
+                merged.append(span)
+        
+        shelf[2] = merged
+        
+        # empty shelves at the bottom give their height back
+        while self._shelves and self._shelves[-1][2] == [[0, self.width]]:
+            self._shelves.pop()
+    
+    def Add(self, handle: ImageHandle) -> tuple:
+        """
+        Packs a fetched image into the atlas if it isn't already, and returns its (x, y, width, height) region.
+        
+        Regions of evicted images are reused: don't keep using the regions returned before.
+        """
+        key = _imageKey(handle)
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._slots.move_to_end(key)
+            return slot
+        
+        dimensions = self._imageManager.GetDimensions(handle)
+        width, height = dimensions.Width, dimensions.Height
+        if width > self.width or height > self.height:
+            raise ValueError("image of " + str(width) + "x" + str(height) + " doesn't fit in the atlas")
+        
+        # read before anything is evicted, so a failure leaves the atlas as it was
+        pixels = self._numpy.frombuffer(self._imageManager.GetData(handle), dtype = self._numpy.uint8).reshape(height, width, 4)
+        
+        slot = self._Allocate(width, height)
+        while slot is None:
+            if not self._slots:
+                raise ValueError("image of " + str(width) + "x" + str(height) + " doesn't fit in the atlas")
+            
+            _, evicted = self._slots.popitem(last = False)
+            self._Free(evicted)
+            slot = self._Allocate(width, height)
+        
+        x, y = slot[0], slot[1]
+        self.pixels[y:y + height, x:x + width] = pixels
+        
+        self._slots[key] = slot
+        self._dirty.append(slot)
+        return slot
+    
+    def Get(self, handle: ImageHandle) -> Optional[tuple]:
+        """
+        Returns the (x, y, width, height) region of an image in the atlas, or None.
+        """
+        key = _imageKey(handle)
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._slots.move_to_end(key)
+        
+        return slot
+    
+    def Remove(self, handle: ImageHandle) -> None:
+        """
+        Frees the region of an image, if in the atlas.
+        """
+        slot = self._slots.pop(_imageKey(handle), None)
+        if slot is not None:
+            self._Free(slot)
+    
+    def Clear(self) -> None:
+        """
+        Frees every region. The pixels are left as they are.
+        """
+        self._slots.clear()
+        self._shelves = []
+        self._dirty = []
+    
+    def TakeDirty(self) -> list:
+        """
+        Returns the (x, y, width, height) regions written since the last call.
+        """
+        dirty, self._dirty = self._dirty, []
+        return dirty
+    
+    def TakeDirtyBounds(self) -> Optional[tuple]:
+        """
+        Returns the (x, y, width, height) region bounding everything written since the last call, or None.
+        """
+        dirty = self.TakeDirty()
+        if not dirty:
+            return None
+        
+        left = min(x for x, _, _, _ in dirty)
+        top = min(y for _, y, _, _ in dirty)
+        right = max(x + width for x, _, width, _ in dirty)
+        bottom = max(y + height for _, y, _, height in dirty)
+        return (left, top, right - left, bottom - top)
+    
+    def __len__(self) -> int:
+        return len(self._slots)
+    
+    def __contains__(self, handle: ImageHandle) -> bool:
+        return _imageKey(handle) in self._slots
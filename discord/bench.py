@@ -0,0 +1,395 @@
+"""
+Measures the per-call and per-event overhead of the bindings.
+
+Runs against the pure-Python stand-in core by default, and prints the
+results as JSON:
+    
+    python -m discord.bench [--output results.json] [--compare baseline.json]
+"""
+from . import sdk
+from .enum import CreateFlags
+import argparse
+import platform
+import json
+import time
+import sys
+
+_benchmarks = []
+
+def benchmark(group):
+    """
+    Registers a benchmark. The function receives a Discord instance and the
+    number of operations, and returns a callable running them.
+    """
+    def decorator(func):
+        _benchmarks.append((group + "." + func.__name__, func))
+        return func
+    
+    return decorator
+
+def _core(discord):
+    from . import standin
+    return standin.cores[-1]
+
+def _drain(discord):
+    discord.RunCallbacks()
+
+# synchronous calls
+
+@benchmark("sync")
+def RelationshipManager_GetAt(discord, number):
+    manager = discord.GetRelationshipManager()
+    count = manager.Count()
+    
+    def run():
+        for index in range(number):
+            manager.GetAt(index % count)
+    
+    return run
+
+@benchmark("sync")
+def RelationshipManager_IterRelationships(discord, number):
+    manager = discord.GetRelationshipManager()
+    count = manager.Count()
+    
+    def run():
+        for _ in range(number // count):
+            for relationship in manager.IterRelationships():
+                pass
+    
+    return run
+
+@benchmark("sync")
+def RelationshipManager_AllRelationships(discord, number):
+    manager = discord.GetRelationshipManager()
+    count = manager.Count()
+    
+    def run():
+        for _ in range(number // count):
+            manager.AllRelationships()
+    
+    return run
+
+@benchmark("sync")
+def RelationshipManager_Get(discord, number):
+    manager = discord.GetRelationshipManager()
+    userId = manager.GetAt(0).User.Id
+    
+    def run():
+        for _ in range(number):
+            manager.Get(userId)
+    
+    return run
+
+@benchmark("sync")
+def LobbyManager_GetLobby(discord, number):
+    manager = discord.GetLobbyManager()
+    
+    def run():
+        for _ in range(number):
+            manager.GetLobby(1)
+    
+    return run
+
+@benchmark("sync")
+def LobbyManager_GetLobbyMetadataValue(discord, number):
+    manager = discord.GetLobbyManager()
+    
+    def run():
+        for _ in range(number):
+            manager.GetLobbyMetadataValue(1, "key0")
+    
+    return run
+
+@benchmark("sync")
+def LobbyManager_GetMemberUserId(discord, number):
+    manager = discord.GetLobbyManager()
+    count = manager.MemberCount(1)
+    
+    def run():
+        for index in range(number):
+            manager.GetMemberUserId(1, index % count)
+    
+    return run
+
+@benchmark("sync")
+def StorageManager_Read(discord, number):
+    manager = discord.GetStorageManager()
+    manager.Write("bench", bytes(1024))
+    
+    def run():
+        for _ in range(number):
+            manager.Read("bench")
+    
+    return run
+
+@benchmark("sync")
+def UserManager_GetCurrentUser(discord, number):
+    manager = discord.GetUserManager()
+    
+    def run():
+        for _ in range(number):
+            manager.GetCurrentUser()
+    
+    return run
+
+@benchmark("sync")
+def NetworkManager_SendMessage(discord, number):
+    from . import standin
+    manager = discord.GetNetworkManager()
+    data = bytes(1024)
+    
+    def run():
+        loopback, standin.config.loopback = standin.config.loopback, False
+        try:
+            for _ in range(number):
+                manager.SendMessage(2, 0, data)
+        finally:
+            standin.config.loopback = loopback
+    
+    return run
+
+@benchmark("sync")
+def NetworkManager_SendMessage_Batched(discord, number):
+    from . import standin
+    manager = discord.GetNetworkManager()
+    manager.SetBatching(True)
+    data = bytes(16)
+    
+    def run():
+        loopback, standin.config.loopback = standin.config.loopback, False
+        try:
+            for _ in range(number):
+                manager.SendMessage(2, 0, data)
+            
+            manager.Flush()
+        finally:
+            standin.config.loopback = loopback
+    
+    return run
+
+# asynchronous round trips: the calls, then the RunCallbacks dispatching their results
+
+@benchmark("async")
+def UserManager_GetUser(discord, number):
+    manager = discord.GetUserManager()
+    callback = lambda result, user: None
+    
+    def run():
+        for index in range(number):
+            manager.GetUser(index, callback)
+        
+        _drain(discord)
+    
+    return run
+
+@benchmark("async")
+def StorageManager_ReadAsync(discord, number):
+    manager = discord.GetStorageManager()
+    manager.Write("bench", bytes(1024))
+    callback = lambda result, data: None
+    
+    def run():
+        for _ in range(number):
+            manager.ReadAsync("bench", callback)
+        
+        _drain(discord)
+    
+    return run
+
+@benchmark("async")
+def StorageManager_WriteAsync(discord, number):
+    manager = discord.GetStorageManager()
+    data = bytes(1024)
+    callback = lambda result: None
+    
+    def run():
+        for _ in range(number):
+            manager.WriteAsync("bench", data, callback)
+        
+        _drain(discord)
+    
+    return run
+
+@benchmark("async")
+def LobbyManager_UpdateLobby(discord, number):
+    manager = discord.GetLobbyManager()
+    callback = lambda result: None
+    
+    def run():
+        for _ in range(number):
+            transaction = manager.GetLobbyUpdateTransaction(1)
+            transaction.SetCapacity(32)
+            manager.UpdateLobby(1, transaction, callback)
+        
+        _drain(discord)
+    
+    return run
+
+@benchmark("async")
+def ActivityManager_UpdateActivity(discord, number):
+    from .model import Activity
+    manager = discord.GetActivityManager()
+    activity = Activity()
+    activity.Name = "bench"
+    callback = lambda result: None
+    
+    def run():
+        for _ in range(number):
+            manager.UpdateActivity(activity, callback)
+        
+        _drain(discord)
+    
+    return run
+
+# event dispatch: the events are queued in the stand-in core, and dispatched by one RunCallbacks
+
+def _events(discord, number, events, name, *args):
+    core = _core(discord)
+    
+    def run():
+        for _ in range(number):
+            core.Emit(events, name, *args)
+        
+        _drain(discord)
+    
+    return run
+
+@benchmark("event")
+def NetworkManager_OnMessage(discord, number):
+    discord.GetNetworkManager().OnMessage = lambda peerId, channelId, data: None
+    data, size = _core(discord).MakeMessage()
+    return _events(discord, number, "network", "on_message", 2, 0, data, size)
+
+@benchmark("event")
+def NetworkManager_OnMessage_Views(discord, number):
+    manager = discord.GetNetworkManager()
+    manager.SetMessageViews(True)
+    manager.OnMessage = lambda peerId, channelId, data: None
+    data, size = _core(discord).MakeMessage()
+    return _events(discord, number, "network", "on_message", 2, 0, data, size)
+
+@benchmark("event")
+def LobbyManager_OnNetworkMessage(discord, number):
+    discord.GetLobbyManager().OnNetworkMessage = lambda lobbyId, userId, channelId, data: None
+    data, size = _core(discord).MakeMessage()
+    return _events(discord, number, "lobby", "on_network_message", 1, 2, 0, data, size)
+
+@benchmark("event")
+def LobbyManager_OnLobbyMessage(discord, number):
+    discord.GetLobbyManager().OnLobbyMessage = lambda lobbyId, userId, message: None
+    message = b"hello"
+    data = (sdk.c_uint8 * len(message)).from_buffer_copy(message)
+    return _events(discord, number, "lobby", "on_lobby_message", 1, 2, data, len(message))
+
+@benchmark("event")
+def RelationshipManager_OnRelationshipUpdate(discord, number):
+    discord.GetRelationshipManager().OnRelationshipUpdate = lambda relationship: None
+    relationship = _core(discord).relationship.relationships[0]
+    return _events(discord, number, "relationship", "on_relationship_update", sdk.pointer(relationship))
+
+@benchmark("event")
+def RelationshipManager_OnRelationshipUpdate_Views(discord, number):
+    manager = discord.GetRelationshipManager()
+    manager.SetEventViews(True)
+    manager.OnRelationshipUpdate = lambda relationship: None
+    relationship = _core(discord).relationship.relationships[0]
+    return _events(discord, number, "relationship", "on_relationship_update", sdk.pointer(relationship))
+
+@benchmark("event")
+def LobbyManager_OnLobbyUpdate(discord, number):
+    discord.GetLobbyManager().OnLobbyUpdate = lambda lobbyId: None
+    return _events(discord, number, "lobby", "on_lobby_update", 1)
+
+def run(number: int = 2000, repeat: int = 5, select = None) -> dict:
+    """
+    Runs the benchmarks whose name contains select, and returns the results.
+    
+    The event benchmarks need the stand-in core to emit events: they are skipped with other libraries.
+    """
+    from . import Discord
+    
+    results = {}
+    for name, func in _benchmarks:
+        if select and select not in name:
+            continue
+        
+        if name.startswith("event.") and sdk.library != "standin":
+            continue
+        
+        discord = Discord(0, CreateFlags.Default)
+        operation = func(discord, number)
+        operation() # warm-up
+        
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            operation()
+            timings.append(time.perf_counter() - start)
+        
+        best = min(timings)
+        results[name] = {
+            "number": number,
+            "repeat": repeat,
+            "best": best,
+            "mean": sum(timings) / len(timings),
+            "nsPerOp": best / number * 1e9,
+            "opsPerSecond": number / best
+        }
+        
+        del discord
+    
+    return results
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Returns the names of the benchmarks slower than baseline by more than threshold (a ratio).
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference and result["nsPerOp"] > reference["nsPerOp"] * threshold:
+            regressions.append(name)
+    
+    return regressions
+
+def main(argv = None) -> int:
+    parser = argparse.ArgumentParser(prog = "python -m discord.bench", description = "Measures the overhead of the Discord Game SDK bindings.")
+    parser.add_argument("--library", default = "standin", help = "library to run against (default: the pure-Python stand-in, the only one running the event benchmarks)")
+    parser.add_argument("--number", type = int, default = 2000, help = "operations per measurement")
+    parser.add_argument("--repeat", type = int, default = 5, help = "measurements per benchmark, the best one is kept")
+    parser.add_argument("--select", help = "only run the benchmarks whose name contains this string")
+    parser.add_argument("--output", help = "write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help = "baseline JSON results; exits with status 1 on regressions")
+    parser.add_argument("--threshold", type = float, default = 1.2, help = "allowed slowdown ratio against the baseline")
+    args = parser.parse_args(argv)
+    
+    sdk.LoadLibrary(args.library)
+    
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "library": args.library,
+        "results": run(args.number, args.repeat, args.select)
+    }
+    
+    status = 0
+    if args.compare:
+        with open(args.compare, "r") as file:
+            baseline = json.load(file)["results"]
+        
+        report["regressions"] = compare(report["results"], baseline, args.threshold)
+        status = 1 if report["regressions"] else 0
+    
+    text = json.dumps(report, indent = 2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
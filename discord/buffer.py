@@ -0,0 +1,78 @@
+import ctypes
+
+_uint8Pointer = ctypes.POINTER(ctypes.c_uint8)
+
+def bufferPointer(data) -> tuple:
+    """
+    Returns a (uint8_t *, length) pair over any object supporting the buffer protocol.
+    
+    Writable, contiguous buffers (bytearray, memoryview, numpy arrays...) and bytes
+    are passed without copying; other read-only buffers are copied once.
+    The pointer is only valid while data is alive and not resized.
+    """
+    if isinstance(data, bytes):
+        return ctypes.cast(data, _uint8Pointer), len(data)
+    
+    view = memoryview(data)
+    if not view.c_contiguous:
+        return (ctypes.c_uint8 * view.nbytes).from_buffer_copy(view.tobytes()), view.nbytes
+    
+    if view.format != "B" or view.ndim != 1:
+        view = view.cast("B")
+    
+    if view.readonly:
+        return (ctypes.c_uint8 * view.nbytes).from_buffer_copy(view), view.nbytes
+    
+    return (ctypes.c_uint8 * view.nbytes).from_buffer(view), view.nbytes
+
+class BufferPool:
+    """
+    Reusable buffers receiving native data with a single memmove.
+    
+    Borrow returns a memoryview which must be given back with Return; it is
+    released then, so it can't be used afterwards. A buffer is only reused once
+    nothing points into it: views, slices and arrays (numpy.frombuffer...) made
+    from the view keep their data, and the next message gets a new buffer.
+    """
+    def __init__(self, size: int = 4096):
+        self._size = size
+        self._free = []
+        self._borrowed = []
+    
+    def Borrow(self, data, length: int) -> memoryview:
+        """
+        Copies length bytes from a native pointer into a pooled buffer, and returns a view over them.
+        """
+        free = self._free
+        if free and len(free[-1][0]) >= length:
+            buffer, address = free.pop()
+        else:
+            size = self._size
+            while size < length:
+                size *= 2
+            
+            buffer = bytearray(size)
+            # the ctypes array is dropped right away, so it doesn't keep the buffer exported
+            address = ctypes.addressof(ctypes.c_char.from_buffer(buffer))
+        
+        # a plain address is the fastest argument to convert
+        ctypes.memmove(address, data, length)
+        self._borrowed.append((buffer, address))
+        return memoryview(buffer)[:length]
+    
+    def Return(self, view: memoryview) -> None:
+        """
+        Releases the last view returned by Borrow, and puts its buffer back in the pool if nothing points into it.
+        """
+        entry = self._borrowed.pop()
+        buffer = entry[0]
+        try:
+            view.release()
+            # resizing fails while anything made from the view is alive, as it keeps the buffer exported;
+            # shrinking by a byte and growing back stays within the allocation, so the address holds
+            buffer.pop()
+            buffer.append(0)
+        except BufferError:
+            return
+        
+        self._free.append(entry)
@@ -0,0 +1,114 @@
+import ctypes
+import inspect
+import itertools
+import threading
+
+# pending callbacks, keyed by the integer passed through callback_data
+_pending = {}
+# handlers of the exceptions raised by some of them, see callWithErrors
+_onError = {}
+_local = threading.local()
+_counter = itertools.count(1)
+
+# one C thunk per callback signature (ctypes caches CFUNCTYPE types)
+_thunks = {}
+
+# number of callbacks and events dispatched so far, used to detect idle ticks
+_dispatched = 0
+
+def _dispatch(callback_data, *args):
+    global _dispatched
+    _dispatched += 1
+    callback = _pending.pop(callback_data, None)
+    onError = _onError.pop(callback_data, None) if _onError else None
+    if callback is None:
+        return
+        
+    if onError is None:
+        callback(*args)
+        return
+        
+    try:
+        callback(*args)
+    except Exception as exception:
+        onError(exception)
+
+def getThunk(functype):
+    """
+    Returns the shared C thunk for a given callback signature.
+    """
+    thunk = _thunks.get(functype)
+    if thunk is None:
+        thunk = _thunks.setdefault(functype, functype(_dispatch))
+    
+    return thunk
+
+def bindCallback(functype, callback):
+    """
+    Registers a one-shot callback and returns the (callback_data, thunk) pair to pass to the SDK.
+    
+    The callback receives every argument but callback_data.
+    """
+    key = next(_counter)
+    _pending[key] = callback
+    onError = getattr(_local, "onError", None)
+    if onError is not None:
+        _onError[key] = onError
+        
+    return ctypes.c_void_p(key), getThunk(functype)
+
+def callWithErrors(onError, method, *args):
+    """
+    Calls method, passing the exceptions raised by the callbacks it binds to onError.
+    
+    Otherwise they are raised into the SDK's thunk, which only prints them.
+    """
+    previous = getattr(_local, "onError", None)
+    _local.onError = onError
+    try:
+        return method(*args)
+    finally:
+        _local.onError = previous
+
+def runCallback(callback_data, *args) -> None:
+    """
+    Runs a callback registered with bindCallback from Python, for results known without calling into the SDK.
+    """
+    _dispatch(callback_data.value, *args)
+
+def pendingCount() -> int:
+    """
+    Returns the number of callbacks still waiting for the SDK.
+    """
+    return len(_pending)
+
+def dispatchedCount() -> int:
+    """
+    Returns the number of callbacks and events dispatched since import.
+    """
+    return _dispatched
+
+def countDispatches(handler):
+    """
+    Wraps an event handler so its calls are counted by dispatchedCount().
+    """
+    def wrapper(*args):
+        global _dispatched
+        _dispatched += 1
+        return handler(*args)
+        
+    return wrapper
+
+def callbackIndex(method):
+    """
+    Returns the position of the callback argument of a manager method, or None if it takes no callback.
+    """
+    try:
+        parameters = [name for name in inspect.signature(method).parameters if name != "self"]
+    except (TypeError, ValueError):
+        return None
+        
+    if parameters and parameters[-1] == "callback":
+        return len(parameters) - 1
+        
+    return None
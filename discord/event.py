@@ -1,9 +1,10 @@
+from .callback import countDispatches
 import ctypes
     
 def bindEvents(structure, *methods):
     contents = structure()
     for index, (name, func) in enumerate(structure._fields_):
-        setattr(contents, name, func(methods[index]))
+        setattr(contents, name, func(countDispatches(methods[index])))
         
     pointer = ctypes.pointer(contents)
     return pointer
\ No newline at end of file
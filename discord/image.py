@@ -1,39 +1,407 @@
 from . import sdk
 from .model import ImageDimensions, ImageHandle
 from .enum import Result
-from .exception import getException
-from typing import Callable, Optional
+from .exception import DiscordException, getException
+from .callback import bindCallback, runCallback
+from .buffer import bufferPointer
+from .arrays import _numpy
+from collections import OrderedDict, deque
+from typing import Callable, Optional, Union
 import ctypes
+import mmap
+import os
+import struct
 
+_diskHeader = struct.Struct("<4sI")
+_diskRecord = struct.Struct("<iqIII")
+_diskMagic = b"DIMG"
+_diskVersion = 1
+
+def _resultOf(exception: Exception) -> Result:
+    # the Result recorded for a fetch which raised instead of calling back
+    if isinstance(exception, DiscordException) and type(exception).__name__ in Result.__members__:
+        return Result[type(exception).__name__]
+        
+    return Result.InternalError
+    
+def _imageKey(handle: ImageHandle) -> tuple:
+    internal = handle._internal
+    return (internal.type, internal.id, internal.size)
+    
+class ImageCache:
+    """
+    Least-recently-used cache of image pixels and dimensions, within a budget in bytes.
+    """
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        
+    def Get(self, key) -> Optional[tuple]:
+        """
+        Returns the (width, height, pixels) cached under key, or None.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+            
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+        
+    def Peek(self, key) -> Optional[tuple]:
+        """
+        Returns the (width, height, pixels) cached under key, or None, without touching the statistics or the order.
+        """
+        return self._entries.get(key)
+        
+    def Put(self, key, width: int, height: int, pixels: bytearray) -> None:
+        """
+        Caches pixels under key, evicting the least recently used images beyond the budget.
+        """
+        self.Remove(key)
+        if len(pixels) > self.budget:
+            return
+            
+        self._entries[key] = (width, height, pixels)
+        self.size += len(pixels)
+        self.SetBudget(self.budget)
+        
+    def Remove(self, key) -> None:
+        """
+        Drops the image cached under key, if any.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[2])
+            
+    def SetBudget(self, budget: int) -> None:
+        """
+        Changes the budget, evicting images if needed.
+        """
+        self.budget = budget
+        entries = self._entries
+        while self.size > budget:
+            _, entry = entries.popitem(last = False)
+            self.size -= len(entry[2])
+            
+    def Clear(self) -> None:
+        """
+        Drops every cached image.
+        """
+        self._entries.clear()
+        self.size = 0
+        
+    def __len__(self) -> int:
+        return len(self._entries)
+        
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+        
+class ImageDiskCache:
+    """
+    Persistent cache of image pixels and dimensions, in an append-only file.
+    
+    The file is a header followed by records: the handle's type, id and size, the width and height,
+    then the pixels. It is indexed when opened, and read through a memory map without copying.
+    A rewritten image is appended again; the newest record wins.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a+b")
+        self._index = {}
+        self._map = None
+        self._view = None
+        try:
+            self._Load()
+        except BaseException:
+            self._file.close()
+            raise
+            
+    def _Load(self) -> None:
+        file = self._file
+        expected = _diskHeader.pack(_diskMagic, _diskVersion)
+        end = file.seek(0, os.SEEK_END)
+        file.seek(0)
+        header = file.read(_diskHeader.size)
+        if len(header) < _diskHeader.size and expected.startswith(header):
+            # empty, or cut short by a crash while it was created
+            file.truncate(0)
+            file.write(expected)
+            file.flush()
+            return
+            
+        if header != expected:
+            raise ValueError(self.path + " is not an image cache file")
+            
+        offset = _diskHeader.size
+        while offset + _diskRecord.size <= end:
+            type, id, size, width, height = _diskRecord.unpack(file.read(_diskRecord.size))
+            start = offset + _diskRecord.size
+            stop = start + width * height * 4
+            if stop > end:
+                break
+                
+            self._index[(type, id, size)] = (width, height, start, stop)
+            offset = file.seek(stop)
+            
+        if offset < end:
+            # the last record was cut short, by a crash while writing it
+            file.truncate(offset)
+            
+    def Get(self, key) -> Optional[tuple]:
+        """
+        Returns the (width, height, pixels) stored under key, pixels being a read-only memoryview over the file, or None.
+        """
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+            
+        width, height, start, stop = entry
+        view = self._view
+        if view is None or len(view) < stop:
+            # the file grew since it was mapped: views over the previous map stay valid
+            self._map = mmap.mmap(self._file.fileno(), 0, access = mmap.ACCESS_READ)
+            self._view = view = memoryview(self._map)
+            
+        return width, height, view[start:stop]
+        
+    def Peek(self, key) -> Optional[tuple]:
+        """
+        Returns the (width, height) stored under key, or None, without reading the pixels.
+        """
+        entry = self._index.get(key)
+        return None if entry is None else entry[:2]
+        
+    def Put(self, key, width: int, height: int, pixels) -> None:
+        """
+        Appends pixels to the file under key, replacing any previous record.
+        """
+        if len(pixels) != width * height * 4:
+            raise ValueError("expected " + str(width * height * 4) + " bytes of pixels, got " + str(len(pixels)))
+            
+        file = self._file
+        offset = file.seek(0, os.SEEK_END)
+        file.write(_diskRecord.pack(key[0], key[1], key[2], width, height))
+        file.write(pixels)
+        file.flush()
+        
+        start = offset + _diskRecord.size
+        self._index[key] = (width, height, start, start + len(pixels))
+        
+    def Close(self) -> None:
+        """
+        Closes the file. Views returned by Get keep their map alive until released.
+        """
+        self._view = None
+        self._map = None
+        self._file.close()
+        
+    def __len__(self) -> int:
+        return len(self._index)
+        
+    def __contains__(self, key) -> bool:
+        return key in self._index
+        
 class ImageManager:
     def __init__(self):
         self._internal = None
-        self._garbage = []
         self._events = None
+        self._cache = None
+        self._disk = None
+        self._inFlight = {}
+        self._completed = deque()
+        
+    def EnableCache(self, budget: int = 16 << 20) -> ImageCache:
+        """
+        Caches the data read by GetData, up to budget bytes, and returns the cache.
+        
+        GetData then returns read-only memoryviews over the cached pixels.
+        """
+        if self._cache is None:
+            self._cache = ImageCache(budget)
+        else:
+            self._cache.SetBudget(budget)
+            
+        return self._cache
+        
+    def DisableCache(self) -> None:
+        """
+        Drops the image cache.
+        """
+        self._cache = None
+        
+    def EnableDiskCache(self, path: str) -> ImageDiskCache:
+        """
+        Stores the fetched images in a file, and returns the disk cache.
+        
+        Images found in it are then fetched without calling into the SDK, even in later runs,
+        and GetData returns read-only memoryviews mapping the file. Fetching with refresh rewrites them.
+        """
+        if self._disk is not None and self._disk.path != path:
+            self.DisableDiskCache()
+            
+        if self._disk is None:
+            self._disk = ImageDiskCache(path)
+            
+        return self._disk
+        
+    def DisableDiskCache(self) -> None:
+        """
+        Closes the disk cache.
+        """
+        if self._disk is not None:
+            self._disk.Close()
+            self._disk = None
+            
+    def _ReadData(self, handle: ImageHandle) -> tuple:
+        dimensions = sdk.DiscordImageDimensions()
+        result = Result(self._internal.get_dimensions(self._internal, handle._internal, dimensions))
+        if result != Result.Ok:
+            raise getException(result)
+            
+        pixels = bytearray(dimensions.width * dimensions.height * 4)
+        buffer, length = bufferPointer(pixels)
+        result = Result(self._internal.get_data(self._internal, handle._internal, buffer, length))
+        if result != Result.Ok:
+            raise getException(result)
+            
+        return dimensions.width, dimensions.height, pixels
         
     def Fetch(self, handle: ImageHandle, refresh: bool, callback: Callable[[Result, Optional[ImageHandle]], None]) -> None:
         """
         Prepares an image to later retrieve data about it.
         
         Returns discord.enum.Result (int) and ImageHandle via callback.
+        
+        Fetching a handle already being fetched doesn't make another request: all the callbacks get its result.
+        Images in the disk cache are returned without calling into the SDK, unless refresh is set.
         """
-        def CCallback(callback_data, result, handle):
-            self._garbage.remove(CCallback)
+        if not refresh and self._disk is not None and _imageKey(handle) in self._disk:
+            # delivered on the next RunCallbacks, like the SDK's results
+            callbackData, _ = bindCallback(self._internal.fetch.argtypes[-1], callback)
+            self._completed.append((callbackData, handle.Detach()))
+            return
+            
+        key = _imageKey(handle) + (bool(refresh),)
+        waiters = self._inFlight.get(key)
+        if waiters is not None:
+            waiters.append(callback)
+            return
+            
+        waiters = self._inFlight[key] = [callback]
+        
+        def CCallback(result, handle):
+            del self._inFlight[key]
             result = Result(result)
             if result == Result.Ok:
-                callback(result, ImageHandle(internal = handle))
+                handle = ImageHandle(internal = handle)
+                if refresh and self._cache is not None:
+                    self._cache.Remove(_imageKey(handle))
+                    
+                if self._disk is not None:
+                    try:
+                        self._disk.Put(_imageKey(handle), *self._ReadData(handle))
+                    except DiscordException:
+                        pass
+                        
+                for index, waiter in enumerate(waiters):
+                    waiter(result, handle if index == 0 else handle.Detach())
             else:
-                callback(result, None)
-                
-        CCallback = self._internal.fetch.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+                for waiter in waiters:
+                    waiter(result, None)
+                    
+        callbackData, CCallback = bindCallback(self._internal.fetch.argtypes[-1], CCallback)
         
-        self._internal.fetch(self._internal, handle._internal, refresh, ctypes.c_void_p(), CCallback)
+        try:
+            self._internal.fetch(self._internal, handle._internal, refresh, callbackData, CCallback)
+        except BaseException:
+            del self._inFlight[key]
+            raise
+            
+    def FetchMany(self, handles: list, refresh: bool, callback: Callable[[list], None], maxInFlight: int = 8, onEach: Optional[Callable[[Result, Optional[ImageHandle]], None]] = None) -> None:
+        """
+        Fetches many images, with at most maxInFlight requests running at once.
         
+        Duplicate handles share a single request. onEach is called with the result and ImageHandle of every
+        distinct image as it completes, and callback once all did, with the list of (Result, ImageHandle)
+        pairs in the order of handles. A fetch raising is recorded as failed, with the Result matching
+        the exception, or InternalError.
+        """
+        handles = list(handles)
+        results = [None] * len(handles)
+        
+        groups = OrderedDict()
+        for index, handle in enumerate(handles):
+            groups.setdefault(_imageKey(handle), []).append(index)
+            
+        queue = deque(groups.values())
+        if not queue:
+            callback(results)
+            return
+            
+        maxInFlight = max(maxInFlight, 1)
+        # requests running, requests not completed, and whether refill is on the stack
+        state = [0, len(queue), False]
+        
+        def done(indexes, result, handle):
+            for index in indexes:
+                results[index] = (result, handle)
+                
+            if onEach is not None:
+                onEach(result, handle)
+                
+            state[0] -= 1
+            state[1] -= 1
+            if state[1] == 0:
+                callback(results)
+            elif not state[2]:
+                refill()
+                
+        def refill():
+            # a loop rather than a recursion through done, for the requests completing right away
+            state[2] = True
+            try:
+                while queue and state[0] < maxInFlight:
+                    indexes = queue.popleft()
+                    state[0] += 1
+                    try:
+                        self.Fetch(handles[indexes[0]], refresh, lambda result, handle, indexes = indexes: done(indexes, result, handle))
+                    except Exception as exception:
+                        done(indexes, _resultOf(exception), None)
+            finally:
+                state[2] = False
+                
+        refill()
+        
+    def _RunCompleted(self) -> None:
+        # the fetches answered from the disk cache; those queued meanwhile wait for the next call
+        completed = self._completed
+        for _ in range(len(completed)):
+            callbackData, handle = completed.popleft()
+            runCallback(callbackData, Result.Ok, handle)
+            
     def GetDimensions(self, handle: ImageHandle) -> ImageDimensions:
         """
         Gets the dimension for the given user's avatar's source image
         """
+        if self._disk is not None:
+            entry = self._disk.Peek(_imageKey(handle))
+            if entry is not None:
+                dimensions = ImageDimensions()
+                dimensions.Width, dimensions.Height = entry
+                return dimensions
+                
+        if self._cache is not None:
+            entry = self._cache.Peek(_imageKey(handle))
+            if entry is not None:
+                dimensions = ImageDimensions()
+                dimensions.Width, dimensions.Height = entry[0], entry[1]
+                return dimensions
+                
         dimensions = sdk.DiscordImageDimensions()
         result = Result(self._internal.get_dimensions(self._internal, handle._internal, dimensions))
         if result != Result.Ok:
@@ -41,10 +409,29 @@ class ImageManager:
             
         return ImageDimensions(internal = dimensions)
         
-    def GetData(self, handle: ImageHandle) -> bytes:
+    def GetData(self, handle: ImageHandle) -> Union[bytes, memoryview]:
         """
         Gets the image data for a given user's avatar.
+        
+        With a cache enabled, returns a read-only memoryview over the cached pixels. Cached pixels are
+        never rewritten: the view keeps them alive and unchanged after they are evicted, refreshed or
+        the cache is disabled, it only shows the image as it was when read.
         """
+        if self._disk is not None:
+            entry = self._disk.Get(_imageKey(handle))
+            if entry is not None:
+                return entry[2]
+                
+        cache = self._cache
+        if cache is not None:
+            key = _imageKey(handle)
+            entry = cache.Get(key)
+            if entry is None:
+                entry = self._ReadData(handle)
+                cache.Put(key, *entry)
+                
+            return memoryview(entry[2]).toreadonly()
+            
         dimensions = self.GetDimensions(handle)
         buffer = (ctypes.c_uint8 * (dimensions.Width * dimensions.Height * 4))()
         
@@ -53,4 +440,44 @@ class ImageManager:
             raise getException(result)
             
         return bytes(buffer)
+        
+    def GetDataInto(self, handle: ImageHandle, out) -> ImageDimensions:
+        """
+        Writes the image data for a given user's avatar into a writable buffer, like a bytearray or a numpy array.
+        
+        Returns the dimensions of the image; out must hold at least Width * Height * 4 bytes.
+        """
+        view = memoryview(out)
+        if view.readonly or not view.c_contiguous:
+            raise TypeError("out must be a writable, contiguous buffer")
+            
+        dimensions = self.GetDimensions(handle)
+        self._GetDataInto(handle, view, dimensions)
+        return dimensions
+        
+    def _GetDataInto(self, handle: ImageHandle, view: memoryview, dimensions: ImageDimensions) -> None:
+        length = dimensions.Width * dimensions.Height * 4
+        if view.nbytes < length:
+            raise getException(Result.InsufficientBuffer)
+            
+        for cache in (self._disk, self._cache):
+            entry = cache.Get(_imageKey(handle)) if cache is not None else None
+            if entry is not None:
+                view.cast("B")[:length] = entry[2]
+                return
+                
+        buffer, _ = bufferPointer(view)
+        result = Result(self._internal.get_data(self._internal, handle._internal, buffer, length))
+        if result != Result.Ok:
+            raise getException(result)
+            
+    def GetArray(self, handle: ImageHandle) -> "numpy.ndarray":
+        """
+        Returns the image data for a given user's avatar as a (height, width, 4) uint8 NumPy array (requires numpy).
+        """
+        numpy = _numpy()
+        dimensions = self.GetDimensions(handle)
+        array = numpy.empty((dimensions.Height, dimensions.Width, 4), dtype = numpy.uint8)
+        self._GetDataInto(handle, memoryview(array), dimensions)
+        return array
         
\ No newline at end of file
@@ -3,6 +3,9 @@ from .model import Lobby, User
 from .enum import Result, LobbyType, LobbySearchComparison, LobbySearchCast, LobbySearchDistance
 from .event import bindEvents
 from .exception import getException
+from .callback import bindCallback
+from .buffer import bufferPointer, BufferPool
+from .arrays import collect
 from typing import Callable, Optional
 import ctypes
 
@@ -147,7 +150,7 @@ class LobbySearchQuery:
 class LobbyManager:
     def __init__(self):
         self._internal = None
-        self._garbage = []
+        self._pool = None
         self._events = bindEvents(sdk.IDiscordLobbyEvents,
             self._OnLobbyUpdate,
             self._OnLobbyDelete,
@@ -175,15 +178,23 @@ class LobbyManager:
         self.OnMemberDisconnect(lobby_id, user_id)
         
     def _OnLobbyMessage(self, event_data, lobby_id, user_id, data, data_length):
-        message = bytes(data[:data_length]).decode("utf8")
+        message = ctypes.string_at(data, data_length).decode("utf8")
         self.OnLobbyMessage(lobby_id, user_id, message)
         
     def _OnSpeaking(self, event_data, lobby_id, user_id, speaking):
         self.OnSpeaking(lobby_id, user_id, speaking)
         
     def _OnNetworkMessage(self, event_data, lobby_id, user_id, channel_id, data, data_length):
-        data = bytes(data[:data_length])
-        self.OnNetworkMessage(lobby_id, user_id, channel_id, data)
+        pool = self._pool
+        if pool is None:
+            self.OnNetworkMessage(lobby_id, user_id, channel_id, ctypes.string_at(data, data_length))
+            return
+        
+        view = pool.Borrow(data, data_length)
+        try:
+            self.OnNetworkMessage(lobby_id, user_id, channel_id, view)
+        finally:
+            pool.Return(view)
         
     def GetLobbyCreateTransaction(self) -> LobbyTransaction:
         """
@@ -224,86 +235,76 @@ class LobbyManager:
         
         Returns discord.enum.Result (int) and Lobby via callback.
         """
-        def CCallback(callback_data, result, lobby):
-            self._garbage.remove(CCallback)
+        def CCallback(result, lobby):
             result = Result(result)
             if result == Result.Ok:
                 callback(result, Lobby(copy = lobby.contents))
             else:
                 callback(result, None)
                 
-        CCallback = self._internal.create_lobby.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.create_lobby.argtypes[-1], CCallback)
         
-        self._internal.create_lobby(self._internal, transaction._internal, ctypes.c_void_p(), CCallback)
+        self._internal.create_lobby(self._internal, transaction._internal, callbackData, CCallback)
         
     def UpdateLobby(self, lobbyId: int, transaction: LobbyTransaction, callback: Callable[[Result], None]) -> None:
         """
         Updates a lobby with data from the given transaction.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.update_lobby.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.update_lobby.argtypes[-1], CCallback)
         
-        self._internal.update_lobby(self._internal, lobbyId, transaction._internal, ctypes.c_void_p(), CCallback)
+        self._internal.update_lobby(self._internal, lobbyId, transaction._internal, callbackData, CCallback)
         
     def DeleteLobby(self, lobbyId: int, callback: Callable[[Result], None]) -> None:
         """
         Deletes a given lobby.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.delete_lobby.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.delete_lobby.argtypes[-1], CCallback)
         
-        self._internal.delete_lobby(self._internal, lobbyId, ctypes.c_void_p(), CCallback)
+        self._internal.delete_lobby(self._internal, lobbyId, callbackData, CCallback)
         
     def ConnectLobby(self, lobbyId: int, lobbySecret: str, callback: Callable[[Result], None]) -> None:
         """
         Connects the current user to a given lobby.
         """
-        def CCallback(callback_data, result, lobby):
-            self._garbage.remove(CCallback)
+        def CCallback(result, lobby):
             result = Result(result)
             if result == Result.Ok:
                 callback(result, Lobby(copy = lobby.contents))
             else:
                 callback(result, None)
             
-        CCallback = self._internal.connect_lobby.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.connect_lobby.argtypes[-1], CCallback)
         
         _lobbySecret = sdk.DiscordLobbySecret()
         _lobbySecret.value = lobbySecret.encode("utf8")
         
-        self._internal.connect_lobby(self._internal, lobbyId, _lobbySecret, ctypes.c_void_p(), CCallback)
+        self._internal.connect_lobby(self._internal, lobbyId, _lobbySecret, callbackData, CCallback)
         
     def ConnectLobbyWithActivitySecret(self, activitySecret: str, callback: Callable[[Result, Optional[Lobby]], None]) -> None:
         """
         Connects the current user to a lobby; requires the special activity secret from the lobby which is a concatenated lobbyId and secret.
         """
-        def CCallback(callback_data, result, lobby):
-            self._garbage.remove(CCallback)
+        def CCallback(result, lobby):
             result = Result(result)
             if result == Result.Ok:
                 callback(result, Lobby(copy = lobby.contents))
             else:
                 callback(result, None)
             
-        CCallback = self._internal.connect_lobby_with_activity_secret.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.connect_lobby_with_activity_secret.argtypes[-1], CCallback)
         
         _activitySecret = sdk.DiscordLobbySecret()
         _activitySecret.value = activitySecret.encode("utf8")
         
-        self._internal.connect_lobby_with_activity_secret(self._internal, _activitySecret, ctypes.c_void_p(), CCallback)
+        self._internal.connect_lobby_with_activity_secret(self._internal, _activitySecret, callbackData, CCallback)
         
     def GetLobbyActivitySecret(self, lobbyId: int) -> str:
         """
@@ -323,15 +324,13 @@ class LobbyManager:
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.disconnect_lobby.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.disconnect_lobby.argtypes[-1], CCallback)
         
-        self._internal.disconnect_lobby(self._internal, lobbyId, ctypes.c_void_p(), CCallback)
+        self._internal.disconnect_lobby(self._internal, lobbyId, callbackData, CCallback)
         
     def GetLobby(self, lobbyId: int) -> Lobby:
         """
@@ -420,6 +419,42 @@ class LobbyManager:
             
         return User(internal = user)
         
+    def IterMemberUserIds(self, lobbyId: int):
+        """
+        Iterates over the user ids of the members of the given lobby.
+        """
+        internal = self._internal
+        getAt = internal.get_member_user_id
+        value = sdk.DiscordUserId()
+        for index in range(self.MemberCount(lobbyId)):
+            result = getAt(internal, lobbyId, index, value)
+            if result != Result.Ok:
+                raise getException(Result(result))
+                
+            yield value.value
+            
+    def AllMemberUserIds(self, lobbyId: int) -> list:
+        """
+        Returns the user ids of the members of the given lobby.
+        """
+        return list(self.IterMemberUserIds(lobbyId))
+        
+    def MembersToArray(self, lobbyId: int) -> "numpy.ndarray":
+        """
+        Returns the users of every member of the given lobby as a NumPy structured array (requires numpy).
+        """
+        userId = sdk.DiscordUserId()
+        
+        def fill(index, record):
+            result = Result(self._internal.get_member_user_id(self._internal, lobbyId, index, userId))
+            if result == Result.Ok:
+                result = Result(self._internal.get_member_user(self._internal, lobbyId, userId, record))
+                
+            if result != Result.Ok:
+                raise getException(result)
+                
+        return collect(sdk.DiscordUser, self.MemberCount(lobbyId), fill)
+        
     def MemberMetadataCount(self, lobbyId: int, userId: int) -> int:
         """
         Gets the number of metadata key/value pairs for the given lobby member.
@@ -465,15 +500,13 @@ class LobbyManager:
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.update_member.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.update_member.argtypes[-1], CCallback)
         
-        self._internal.update_member(self._internal, lobbyId, userId, transaction._internal, ctypes.c_void_p(), CCallback)
+        self._internal.update_member(self._internal, lobbyId, userId, transaction._internal, callbackData, CCallback)
         
     def SendLobbyMessage(self, lobbyId: int, data: str, callback: Callable[[Result], None]) -> None:
         """
@@ -481,17 +514,15 @@ class LobbyManager:
         
         Returns Discord.result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.send_lobby_message.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.send_lobby_message.argtypes[-1], CCallback)
         
         data = data.encode("utf8")
-        data = (ctypes.c_uint8 * len(data))(*data)
-        self._internal.send_lobby_message(self._internal, lobbyId, data, len(data), ctypes.c_void_p(), CCallback)
+        buffer, length = bufferPointer(data)
+        self._internal.send_lobby_message(self._internal, lobbyId, buffer, length, callbackData, CCallback)
         
     def GetSearchQuery(self) -> LobbySearchQuery:
         """
@@ -512,15 +543,13 @@ class LobbyManager:
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.search.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.search.argtypes[-1], CCallback)
         
-        self._internal.search(self._internal, search._internal, ctypes.c_void_p(), CCallback)
+        self._internal.search(self._internal, search._internal, callbackData, CCallback)
         
     def LobbyCount(self) -> int:
         """
@@ -543,21 +572,55 @@ class LobbyManager:
             
         return lobbyId.value
         
+    def IterLobbyIds(self):
+        """
+        Iterates over the ids of the lobbies found by Search().
+        """
+        internal = self._internal
+        getAt = internal.get_lobby_id
+        value = sdk.DiscordLobbyId()
+        for index in range(self.LobbyCount()):
+            result = getAt(internal, index, value)
+            if result != Result.Ok:
+                raise getException(Result(result))
+                
+            yield value.value
+            
+    def AllLobbyIds(self) -> list:
+        """
+        Returns the ids of the lobbies found by Search().
+        """
+        return list(self.IterLobbyIds())
+        
+    def LobbiesToArray(self) -> "numpy.ndarray":
+        """
+        Returns the lobbies found by Search() as a NumPy structured array (requires numpy).
+        """
+        lobbyId = sdk.DiscordLobbyId()
+        
+        def fill(index, record):
+            result = Result(self._internal.get_lobby_id(self._internal, index, lobbyId))
+            if result == Result.Ok:
+                result = Result(self._internal.get_lobby(self._internal, lobbyId, record))
+                
+            if result != Result.Ok:
+                raise getException(result)
+                
+        return collect(sdk.DiscordLobby, self.LobbyCount(), fill)
+        
     def ConnectVoice(self, lobbyId: int, callback: Callable[[Result], None]) -> None:
         """
         Connects to the voice channel of the current lobby.
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.connect_voice.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.connect_voice.argtypes[-1], CCallback)
         
-        self._internal.connect_voice(self._internal, lobbyId, ctypes.c_void_p(), CCallback)
+        self._internal.connect_voice(self._internal, lobbyId, callbackData, CCallback)
         
     def DisconnectVoice(self, lobbyId: int, callback: Callable[[Result], None]) -> None:
         """
@@ -565,15 +628,13 @@ class LobbyManager:
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.disconnect_voice.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.disconnect_voice.argtypes[-1], CCallback)
         
-        self._internal.disconnect_voice(self._internal, lobbyId, ctypes.c_void_p(), CCallback)
+        self._internal.disconnect_voice(self._internal, lobbyId, callbackData, CCallback)
         
     def OnLobbyUpdate(self, lobbyId: int) -> None:
         """
@@ -652,15 +713,27 @@ class LobbyManager:
     def SendNetworkMessage(self, lobbyId: int, userId: int, channelId: int, data: bytes) -> None:
         """
         Sends a network message to the given user ID that is a member of the given lobby ID over the given channel ID.
+        
+        Accepts bytes, bytearray, memoryview or any other buffer.
         """
-        data = (ctypes.c_uint8 * len(data))(*data)
-        result = Result(self._internal.send_network_message(self._internal, lobbyId, userId, channelId, data, len(data)))
+        buffer, length = bufferPointer(data)
+        result = Result(self._internal.send_network_message(self._internal, lobbyId, userId, channelId, buffer, length))
         if result != Result.Ok:
             raise getException(result)
             
+    def SetNetworkMessageViews(self, enabled: bool) -> None:
+        """
+        Makes OnNetworkMessage receive a memoryview over a reused buffer instead of bytes.
+        
+        The view is released when the handler returns; views, slices or arrays made from it stay valid.
+        """
+        self._pool = BufferPool() if enabled else None
+        
     def OnNetworkMessage(self, lobbyId: int, userId: int, channelId: int, data: bytes) -> None:
         """
         Fires when the user receives a message from the lobby's networking layer.
+        
+        Data is a memoryview after SetNetworkMessageViews(True).
         """
         pass
         
\ No newline at end of file
@@ -1,65 +1,203 @@
 from . import sdk
 from .enum import Status, RelationshipType, ImageType, LobbyType, InputModeType, SkuType, EntitlementType, ActivityPartyPrivacy, ActivitySupportedPlatformFlags
 from enum import Enum
+import operator
 import ctypes
 
-class Model:
+def _field(field: str, ftype, offset: int, size: int) -> property:
+    get = operator.attrgetter(field)
+    
+    if ftype == int:
+        def fget(self):
+            return get(self._internal)
+            
+        def fset(self, value):
+            setattr(self._internal, field, int(value))
+            
+    elif ftype == str:
+        # decoded strings are cached per instance, the struct only changes through the setters
+        def fget(self):
+            try:
+                return self._strings[field]
+            except AttributeError:
+                self._strings = {}
+            except KeyError:
+                pass
+                
+            value = self._strings[field] = get(self._internal).decode("utf8")
+            return value
+            
+        def fset(self, value):
+            try:
+                strings = self._strings
+            except AttributeError:
+                strings = self._strings = {}
+                
+            if strings.get(field) != value:
+                data = value.encode("utf8")
+                if len(data) > size:
+                    raise ValueError("bytes too long (" + str(len(data)) + ", maximum length " + str(size) + ")")
+                    
+                # the whole array is written, so equal strings leave equal bytes behind
+                ctypes.memmove(ctypes.addressof(self._internal) + offset, data.ljust(size, b"\0"), size)
+                strings[field] = get(self._internal).decode("utf8")
+            
+    elif ftype == bool:
+        def fget(self):
+            return bool(get(self._internal))
+            
+        def fset(self, value):
+            setattr(self._internal, field, bool(value))
+            
+    elif issubclass(ftype, Model):
+        slot = "_" + field
+        model = operator.attrgetter(slot)
+        
+        # the wrapper is created on first access, as a view over the parent's struct
+        def fget(self):
+            try:
+                return model(self)
+            except AttributeError:
+                value = ftype(internal = get(self._internal))
+                setattr(self, slot, value)
+                return value
+                
+        def fset(self, value):
+            setattr(self._internal, field, value._internal)
+            wrapper = getattr(self, slot, None)
+            if wrapper is not None:
+                wrapper._Invalidate()
+            
+    elif issubclass(ftype, Enum):
+        def fget(self):
+            return ftype(get(self._internal))
+            
+        def fset(self, value):
+            setattr(self._internal, field, value.value)
+            
+    else:
+        raise TypeError(ftype)
+        
+    return property(fget, fset)
+    
+def _fromBytes(cls, data):
+    return cls.FromBytes(data)
+    
+class _ModelType(type):
+    """
+    Turns the _fields_ of a model into properties, when the class is created.
+    """
+    def __new__(mcs, name, bases, namespace):
+        fields = namespace.get("_fields_")
+        if fields is not None and "__slots__" not in namespace:
+            # a slot per nested model, holding its wrapper once created
+            namespace["_nested"] = tuple("_" + field for _, field, ftype in fields if issubclass(ftype, Model))
+            namespace["__slots__"] = namespace["_nested"]
+            
+        return super().__new__(mcs, name, bases, namespace)
+        
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        if "_fields_" not in namespace:
+            return
+            
+        cls._fields = {}
+        cls._layout = []
+        for key, field, ftype in cls._fields_:
+            cfield = getattr(cls._struct_, field)
+            cls._fields[key] = (field, ftype)
+            cls._layout.append((key, cfield.offset, cfield.offset + cfield.size))
+            setattr(cls, key, _field(field, ftype, cfield.offset, cfield.size))
+            
+class Model(metaclass = _ModelType):
+    __slots__ = ("_internal", "_strings")
+    _fields = {}
+    _layout = []
+    _nested = ()
+    
     def __init__(self, **kwargs):
-        self._internal = kwargs.get("internal", self._struct_())
+        internal = kwargs.get("internal")
+        self._internal = internal if internal is not None else self._struct_()
         if "copy" in kwargs:
             ctypes.memmove(ctypes.byref(self._internal), ctypes.byref(kwargs["copy"]), ctypes.sizeof(self._struct_))
             
-        self._fields = {}
+    def Detach(self) -> "Model":
+        """
+        Returns a copy owning its memory, for models backed by the SDK's.
+        """
+        return type(self)(copy = self._internal)
         
-        for name, field, ftype in self._fields_:
-            self._fields[name] = (field, ftype)
-            if issubclass(ftype, Model):
-                setattr(self, "_" + field, ftype(internal = getattr(self._internal, field)))
-                
-    def __getattribute__(self, key):
-        if key.startswith("_"):
-            return super().__getattribute__(key)
-        else:
-            field = self._fields[key]
-            value = getattr(self._internal, field[0])
-            if field[1] == int:
-                return int(value)
-            elif field[1] == str:
-                return value.decode("utf8")
-            elif field[1] == bool:
-                return bool(value)
-            elif issubclass(field[1], Model):
-                return getattr(self, "_" + field[0])
-            elif issubclass(field[1], Enum):
-                return field[1](int(value))
-            else:
-                raise TypeError(field[1])
-                    
-    def __setattr__(self, key, value):
-        if key.startswith("_"):
-            super().__setattr__(key, value)
-        else:
-            field = self._fields[key]
-            if field[1] == int:
-                value = int(value)
-                setattr(self._internal, field[0], value)
-            elif field[1] == str:
-                value = value.encode("utf8")
-                setattr(self._internal, field[0], value)
-            elif field[1] == bool:
-                value = bool(value)
-                setattr(self._internal, field[0], value)
-            elif issubclass(field[1], Model):
-                setattr(self, "_" + field[0], value)
-                setattr(self._internal, field[0], value._internal)
-            elif issubclass(field[1], Enum):
-                setattr(self._internal, field[0], value.value)
-            else:
-                raise TypeError(field[1])
-
-    def __dir__(self):
-        return super().__dir__() + list(self._fields.keys())
+    def ToBytes(self) -> bytes:
+        """
+        Returns the raw bytes of the struct.
+        """
+        return bytes(self._internal)
+        
+    @classmethod
+    def FromBytes(cls, data) -> "Model":
+        """
+        Builds a model from the raw bytes of its struct, as returned by ToBytes.
+        """
+        return cls(internal = cls._struct_.from_buffer_copy(data))
+        
+    @classmethod
+    def PackMany(cls, models) -> bytes:
+        """
+        Packs the structs of many models into one contiguous buffer.
+        """
+        return b"".join([bytes(model._internal) for model in models])
+        
+    @classmethod
+    def UnpackMany(cls, data) -> list:
+        """
+        Unpacks a buffer returned by PackMany; the models share a single copy of it.
+        """
+        size = ctypes.sizeof(cls._struct_)
+        count, extra = divmod(len(data), size)
+        if extra:
+            raise ValueError("buffer size (" + str(len(data)) + ") is not a multiple of the record size (" + str(size) + ")")
+            
+        array = (cls._struct_ * count).from_buffer_copy(data)
+        return [cls(internal = record) for record in array]
         
+    def Diff(self, other: "Model") -> list:
+        """
+        Returns the names of the fields whose bytes differ between the two models.
+        """
+        if type(other) is not type(self):
+            raise TypeError("cannot diff " + type(self).__name__ + " with " + type(other).__name__)
+            
+        mine = bytes(self._internal)
+        theirs = bytes(other._internal)
+        if mine == theirs:
+            return []
+            
+        return [key for key, start, end in self._layout if mine[start:end] != theirs[start:end]]
+        
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+            
+        return bytes(self._internal) == bytes(other._internal)
+        
+    def __hash__(self):
+        return hash(bytes(self._internal))
+        
+    def __reduce__(self):
+        return _fromBytes, (type(self), bytes(self._internal))
+        
+    def _Invalidate(self) -> None:
+        # drops the decoded strings, after the struct was rewritten behind our back
+        try:
+            del self._strings
+        except AttributeError:
+            pass
+            
+        for slot in self._nested:
+            wrapper = getattr(self, slot, None)
+            if wrapper is not None:
+                wrapper._Invalidate()
+                
 class User(Model):
     _struct_ = sdk.DiscordUser
     _fields_ = [
@@ -2,23 +2,138 @@ from . import sdk
 from .enum import Result
 from .exception import getException
 from .event import bindEvents
+from .buffer import bufferPointer, BufferPool
 import ctypes
+import struct
+
+# batched packets are a sequence of frames: a little-endian uint16 length, or 0xffff then
+# a uint32 length, followed by the message
+_shortFrame = struct.Struct("<H")
+_longFrame = struct.Struct("<HI")
+
+def _frameHeader(length: int) -> bytes:
+    if length < 0xffff:
+        return _shortFrame.pack(length)
+        
+    return _longFrame.pack(0xffff, length)
+    
+def _unframe(packet):
+    offset = 0
+    size = len(packet)
+    while offset + 2 <= size:
+        length, = _shortFrame.unpack_from(packet, offset)
+        offset += 2
+        if length == 0xffff:
+            if offset + 4 > size:
+                return
+                
+            length, = struct.unpack_from("<I", packet, offset)
+            offset += 4
+            
+        if offset + length > size:
+            return
+            
+        yield offset, offset + length
+        offset += length
 
 class NetworkManager:
     def __init__(self):
         self._internal = None
+        self._pool = None
+        self._batches = None
+        self._budget = 0
         self._events = bindEvents(sdk.IDiscordNetworkEvents,
             self._OnMessage,
             self._OnRouteUpdate
         )
         
     def _OnMessage(self, event_data, peer_id, channel_id, data, data_length):
-        data = bytes(data[:data_length])
-        self.OnMessage(peer_id, channel_id, data)
+        pool = self._pool
+        if pool is None:
+            self._Deliver(peer_id, channel_id, ctypes.string_at(data, data_length))
+            return
+        
+        view = pool.Borrow(data, data_length)
+        try:
+            self._Deliver(peer_id, channel_id, view)
+        finally:
+            pool.Return(view)
+            
+    def _Deliver(self, peerId, channelId, packet):
+        if self._batches is None:
+            self.OnMessage(peerId, channelId, packet)
+            return
+            
+        if isinstance(packet, bytes):
+            for start, end in _unframe(packet):
+                self.OnMessage(peerId, channelId, packet[start:end])
+                
+            return
+            
+        # slices outlive the release of the pooled view: each one is released when its handler returns
+        for start, end in _unframe(packet):
+            with packet[start:end] as message:
+                self.OnMessage(peerId, channelId, message)
         
     def _OnRouteUpdate(self, event_data, route_data):
         self.OnRouteUpdate(route_data.decode("utf8"))
         
+    def SetMessageViews(self, enabled: bool) -> None:
+        """
+        Makes OnMessage receive a memoryview over a reused buffer instead of bytes.
+        
+        The view is released when the handler returns; views, slices or arrays made from it stay valid.
+        """
+        self._pool = BufferPool() if enabled else None
+        
+    def SetBatching(self, enabled: bool, budget: int = 1200) -> None:
+        """
+        Coalesces the messages sent to each peer and channel into packets of up to budget bytes.
+        
+        Batches are sent when full, on Flush, and at the end of every Discord.RunCallbacks.
+        The peers must enable batching too, as received packets are split back into messages.
+        """
+        if self._batches and self._internal:
+            self.Flush()
+            
+        self._batches = {} if enabled else None
+        self._budget = budget
+        
+    def _Send(self, peerId, channelId, data) -> None:
+        buffer, length = bufferPointer(data)
+        result = Result(self._internal.send_message(self._internal, peerId, channelId, buffer, length))
+        if result != Result.Ok:
+            raise getException(result)
+            
+    def _Batch(self, peerId, channelId, data) -> None:
+        view = memoryview(data)
+        header = _frameHeader(view.nbytes)
+        size = len(header) + view.nbytes
+        
+        key = (peerId, channelId)
+        batches = self._batches
+        batch = batches.get(key)
+        if batch is not None and len(batch) + size > self._budget:
+            self._SendBatch(key)
+            batch = None
+            
+        if batch is None:
+            batch = batches[key] = bytearray()
+            
+        batch += header
+        batch += view
+        if len(batch) >= self._budget:
+            self._SendBatch(key)
+            
+    def _SendBatch(self, key) -> None:
+        batch = self._batches.pop(key)
+        self._Send(key[0], key[1], batch)
+        
+    def _SendBatches(self, peerId = None) -> None:
+        for key in list(self._batches):
+            if peerId is None or key[0] == peerId:
+                self._SendBatch(key)
+        
     def GetPeerId(self) -> int:
         """
         Get the networking peer ID for the current user, allowing other users to send packets to them.
@@ -30,7 +145,12 @@ class NetworkManager:
     def Flush(self) -> None:
         """
         Flushes the network
+        
+        Batched messages are sent first.
         """
+        if self._batches:
+            self._SendBatches()
+            
         result = Result(self._internal.flush(self._internal))
         if result != Result.Ok:
             raise getException(result)
@@ -64,16 +184,21 @@ class NetworkManager:
     def SendMessage(self, peerId: int, channelId: int, data: bytes) -> None:
         """
         Sends data to a given peer ID through the given channel.
+        
+        Data can be any object supporting the buffer protocol, and is not copied.
         """
-        data = (ctypes.c_uint8 * len(data))(*data)
-        result = Result(self._internal.send_message(self._internal, peerId, channelId, data, len(data)))
-        if result != Result.Ok:
-            raise getException(result)
+        if self._batches is not None:
+            self._Batch(peerId, channelId, data)
+        else:
+            self._Send(peerId, channelId, data)
         
     def CloseChannel(self, peerId: int, channelId: int) -> None:
         """
         Close the connection to a given user by peerId on the given channel.
         """
+        if self._batches and (peerId, channelId) in self._batches:
+            self._SendBatch((peerId, channelId))
+            
         result = Result(self._internal.close_channel(self._internal, peerId, channelId))
         if result != Result.Ok:
             raise getException(result)
@@ -82,6 +207,9 @@ class NetworkManager:
         """
         Disconnects the network session to another Discord user.
         """
+        if self._batches:
+            self._SendBatches(peerId)
+            
         result = Result(self._internal.close_peer(self._internal, peerId))
         if result != Result.Ok:
             raise getException(result)
@@ -89,6 +217,8 @@ class NetworkManager:
     def OnMessage(self, peerId: int, channelId: int, data: bytes) -> None:
         """
         Fires when you receive data from another user.
+        
+        Data is a memoryview after SetMessageViews(True).
         """
         pass
         
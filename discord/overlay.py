@@ -3,6 +3,7 @@ from .model import Rect, ImeUnderline
 from .enum import Result, ActivityActionType, KeyVariant, MouseButton
 from .event import bindEvents
 from .exception import getException
+from .callback import bindCallback
 from typing import Callable
 import ctypes
 
@@ -37,58 +38,50 @@ class OverlayManager:
         """
         Locks or unlocks input in the overlay.
         """
-        def CCallback(event_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.set_locked.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.set_locked.argtypes[-1], CCallback)
         
-        self._internal.set_locked(self._internal, locked, ctypes.c_void_p(), CCallback)
+        self._internal.set_locked(self._internal, locked, callbackData, CCallback)
         
     def OpenActivityInvite(self, type: ActivityActionType, callback: Callable[[Result], None]) -> None:
         """
         Opens the overlay modal for sending game invitations to users, channels, and servers.
         """
-        def CCallback(event_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.open_activity_invite.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.open_activity_invite.argtypes[-1], CCallback)
         
-        self._internal.open_activity_invite(self._internal, type, ctypes.c_void_p(), CCallback)
+        self._internal.open_activity_invite(self._internal, type, callbackData, CCallback)
         
     def OpenGuildInvite(self, code: str, callback: Callable[[Result], None]) -> None:
         """
         Opens the overlay modal for joining a Discord guild, given its invite code.
         """
-        def CCallback(event_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.open_guild_invite.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.open_guild_invite.argtypes[-1], CCallback)
         
         code = ctypes.c_char_p(code.encode("utf8"))
-        self._internal.open_guild_invite(self._internal, code, ctypes.c_void_p(), CCallback)
+        self._internal.open_guild_invite(self._internal, code, callbackData, CCallback)
         
     def OpenVoiceSettings(self, callback: Callable[[Result], None]) -> None:
         """
         Opens the overlay widget for voice settings for the currently connected application.
         """
-        def CCallback(event_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.open_voice_settings.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.open_voice_settings.argtypes[-1], CCallback)
         
-        self._internal.open_voice_settings(self._internal, ctypes.c_void_p(), CCallback)
+        self._internal.open_voice_settings(self._internal, callbackData, CCallback)
         
     def OnToggle(self, locked: bool) -> None:
         """
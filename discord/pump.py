@@ -0,0 +1,225 @@
+from .callback import dispatchedCount
+from concurrent.futures import Future
+from collections import deque
+import threading
+import time
+import weakref
+
+class PumpStats:
+    def __init__(self):
+        self.ticks = 0
+        self.idleTicks = 0
+        self.dispatched = 0
+        self.rate = 0.0
+        self.lastTickTime = 0.0
+        self.maxTickTime = 0.0
+        self.totalTickTime = 0.0
+    
+    def copy(self) -> "PumpStats":
+        stats = PumpStats()
+        stats.__dict__.update(self.__dict__)
+        return stats
+
+class CallbackPump:
+    """
+    Runs Discord.RunCallbacks on a dedicated thread.
+    
+    The tick rate jumps to maxHz whenever a tick dispatches callbacks or events,
+    and halves on every idle tick down to minHz. Only a weak reference to the
+    Discord instance is kept: the pump stops once it is collected.
+    """
+    def __init__(self, discord, minHz: float, maxHz: float):
+        if minHz <= 0 or maxHz < minHz:
+            raise ValueError("expected 0 < minHz <= maxHz")
+        
+        self._discord = weakref.ref(discord)
+        self.minHz = minHz
+        self.maxHz = maxHz
+        self.error = None
+        
+        self._stats = PumpStats()
+        self._stats.rate = maxHz
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+        self._commands = deque()
+        self._futures = set()
+    
+    @property
+    def discord(self):
+        return self._discord()
+        
+    def Start(self) -> None:
+        """
+        Starts the pump thread.
+        """
+        if self._thread is not None:
+            return
+        
+        self._running = True
+        self._thread = threading.Thread(target = self._Run, name = "discord-pump", daemon = True)
+        self._thread.start()
+    
+    def Stop(self) -> None:
+        """
+        Stops the pump thread and waits for it to exit.
+        
+        Raises the exception which stopped the thread, if RunCallbacks failed.
+        """
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        
+        self._running = False
+        self._wake.set()
+        if thread is not threading.current_thread():
+            thread.join()
+            
+        if self.error is not None:
+            raise self.error
+    
+    def Wake(self) -> None:
+        """
+        Runs the next tick immediately, at full rate.
+        """
+        with self._lock:
+            self._stats.rate = self.maxHz
+        
+        self._wake.set()
+    
+    def Submit(self, func, *args) -> Future:
+        """
+        Queues a call to run on the pump thread before the next RunCallbacks.
+        
+        Returns a future resolving to the call's return value. Calls made
+        from the pump thread itself run immediately.
+        """
+        future = Future()
+        
+        def command():
+            if not future.set_running_or_notify_cancel():
+                return
+                
+            try:
+                future.set_result(func(*args))
+            except BaseException as exception:
+                future.set_exception(exception)
+                
+        self.Queue(command)
+        return future
+        
+    def Queue(self, command) -> None:
+        """
+        Queues a callable to run on the pump thread before the next RunCallbacks.
+        """
+        if self.InPumpThread():
+            command()
+            return
+            
+        with self._lock:
+            if not self._running:
+                if self.error is not None:
+                    raise self.error
+                    
+                raise RuntimeError("the callback pump is not running")
+                
+            commands = self._commands
+            commands.append(command)
+            first = len(commands) == 1
+            
+        # commands queued before the pump wakes up are batched in the same tick
+        if first:
+            self.Wake()
+            
+    def _Track(self, future: Future) -> None:
+        # futures resolved by SDK callbacks, failed if the pump dies before they are
+        with self._lock:
+            if self.error is None:
+                self._futures.add(future)
+                future.add_done_callback(self._futures.discard)
+                return
+                
+        if not future.done():
+            future.set_exception(self.error)
+            
+    def InPumpThread(self) -> bool:
+        """
+        Whether the caller is running on the pump thread.
+        """
+        return self._thread is threading.current_thread()
+        
+    def IsRunning(self) -> bool:
+        """
+        Whether the pump thread is running.
+        """
+        return self._thread is not None and self._thread.is_alive()
+    
+    def GetStats(self) -> PumpStats:
+        """
+        Returns a snapshot of the tick statistics.
+        """
+        with self._lock:
+            return self._stats.copy()
+    
+    def _Tick(self) -> None:
+        commands = self._commands
+        for _ in range(len(commands)):
+            commands.popleft()()
+            
+        discord = self._discord()
+        if discord is None:
+            self._running = False
+            return
+            
+        discord.RunCallbacks()
+    
+    def _Run(self) -> None:
+        while self._running:
+            self._wake.clear()
+            before = dispatchedCount()
+            start = time.perf_counter()
+            try:
+                self._Tick()
+            except Exception as exception:
+                self.error = exception
+                self._running = False
+                break
+            
+            elapsed = time.perf_counter() - start
+            dispatched = dispatchedCount() - before
+            
+            with self._lock:
+                stats = self._stats
+                stats.ticks += 1
+                stats.dispatched += dispatched
+                stats.lastTickTime = elapsed
+                stats.totalTickTime += elapsed
+                stats.maxTickTime = max(stats.maxTickTime, elapsed)
+                
+                if dispatched:
+                    stats.rate = self.maxHz
+                else:
+                    stats.idleTicks += 1
+                    stats.rate = max(stats.rate / 2, self.minHz)
+                
+                interval = 1 / stats.rate
+            
+            self._wake.wait(max(interval - elapsed, 0))
+            
+        # commands queued before the pump stopped still run
+        with self._lock:
+            commands = list(self._commands)
+            self._commands.clear()
+            
+        for command in commands:
+            command()
+            
+        if self.error is not None:
+            with self._lock:
+                futures = list(self._futures)
+                self._futures.clear()
+                
+            for future in futures:
+                if not future.done():
+                    future.set_exception(self.error)
@@ -1,35 +1,249 @@
 from . import sdk
 from .model import Relationship
-from .enum import Result
+from .enum import Result, RelationshipType, Status
 from .event import bindEvents
 from .exception import getException
-from typing import Callable
+from .arrays import collect
+from typing import Callable, Optional, Union
 import ctypes
 
+# the filter reads the struct as int32 words: these are the indexes of the filterable fields
+_typeWord = sdk.DiscordRelationship.type.offset // 4
+_statusWord = (sdk.DiscordRelationship.presence.offset + sdk.DiscordPresence.status.offset) // 4
+_wordFilter = ctypes.CFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.POINTER(ctypes.c_int32))
+_compiled = {}
+
+def _values(values) -> Optional[frozenset]:
+    if values is None:
+        return None
+        
+    if isinstance(values, int):
+        return frozenset((int(values),))
+        
+    return frozenset(int(value) for value in values)
+    
+def _detached(relationships) -> list:
+    return [relationship.Detach() for relationship in relationships]
+    
+class RelationshipFilter:
+    """
+    Declarative filter for RelationshipManager.Filter, matching on type and presence status.
+    
+    Each condition is a value or a collection of values. The filter reads the raw
+    struct fields, without building any model, and is compiled once per set of conditions.
+    """
+    def __init__(self, type = None, status = None, notType = None, notStatus = None):
+        checks = []
+        for word, values, include in (
+            (_typeWord, _values(type), True),
+            (_statusWord, _values(status), True),
+            (_typeWord, _values(notType), False),
+            (_statusWord, _values(notStatus), False)
+        ):
+            if values is not None:
+                checks.append((word, values, include))
+                
+        self._checks = tuple(checks)
+        
+    def __eq__(self, other):
+        return isinstance(other, RelationshipFilter) and self._checks == other._checks
+        
+    def __hash__(self):
+        return hash(self._checks)
+        
+    def _Compile(self, functype):
+        compiled = _compiled.get((self._checks, functype))
+        if compiled is None:
+            checks = self._checks
+            
+            def CFilter(filter_data, words):
+                for word, values, include in checks:
+                    if (words[word] in values) != include:
+                        return False
+                        
+                return True
+                
+            # the SDK passes a DiscordRelationship *, we take it as an int32 * to index the fields directly
+            CFilter = _wordFilter(CFilter)
+            compiled = _compiled[(self._checks, functype)] = (CFilter, ctypes.cast(CFilter, functype))
+            
+        return compiled[1]
+        
+class RelationshipIndex:
+    """
+    In-memory copy of the relationships, indexed by user id, type and status.
+    
+    Maintained by the RelationshipManager once enabled with EnableIndex(); it is only
+    exact while no filter is applied with Filter(). The relationships returned are copies,
+    changing them doesn't affect the index.
+    """
+    def __init__(self):
+        self._byId = {}
+        self._byType = {}
+        self._byStatus = {}
+        
+    def _Reset(self, relationships) -> None:
+        self._byId.clear()
+        self._byType.clear()
+        self._byStatus.clear()
+        for relationship in relationships:
+            self._Put(relationship)
+            
+    def _Put(self, relationship: Relationship) -> None:
+        internal = relationship._internal
+        userId = internal.user.id
+        self._Remove(userId)
+        if internal.type == RelationshipType.None_:
+            return
+            
+        self._byId[userId] = relationship
+        self._byType.setdefault(internal.type, {})[userId] = relationship
+        self._byStatus.setdefault(internal.presence.status, {})[userId] = relationship
+        
+    def _Remove(self, userId: int) -> None:
+        previous = self._byId.pop(userId, None)
+        if previous is not None:
+            internal = previous._internal
+            del self._byType[internal.type][userId]
+            del self._byStatus[internal.presence.status][userId]
+            
+    def __len__(self) -> int:
+        return len(self._byId)
+        
+    def __contains__(self, userId: int) -> bool:
+        return userId in self._byId
+        
+    def __iter__(self):
+        return iter(_detached(self._byId.values()))
+        
+    def Get(self, userId: int) -> Optional[Relationship]:
+        """
+        Returns the relationship with the given user, or None.
+        """
+        relationship = self._byId.get(userId)
+        return None if relationship is None else relationship.Detach()
+        
+    def GetByType(self, type: RelationshipType) -> list:
+        """
+        Returns the relationships of the given type.
+        """
+        return _detached(self._byType.get(type, {}).values())
+        
+    def GetByStatus(self, status: Status) -> list:
+        """
+        Returns the relationships whose presence has the given status.
+        """
+        return _detached(self._byStatus.get(status, {}).values())
+        
+    def Query(self, type: Optional[RelationshipType] = None, status: Optional[Status] = None) -> list:
+        """
+        Returns the relationships matching both the type and the status, when given.
+        """
+        if type is None:
+            return _detached(self._byId.values()) if status is None else self.GetByStatus(status)
+            
+        byType = self._byType.get(type, {})
+        if status is None:
+            return _detached(byType.values())
+            
+        byStatus = self._byStatus.get(status, {})
+        if len(byStatus) < len(byType):
+            return [relationship.Detach() for userId, relationship in byStatus.items() if userId in byType]
+            
+        return [relationship.Detach() for userId, relationship in byType.items() if userId in byStatus]
+        
 class RelationshipManager:
     def __init__(self):
         self._internal = None
-        self._garbage = []
+        self._views = False
+        self._filter = None
+        self._index = None
         self._events = bindEvents(sdk.IDiscordRelationshipEvents,
             self._OnRefresh,
             self._OnRelationshipUpdate
         )
         
     def _OnRefresh(self, event_data):
+        if self._index is not None:
+            self._SeedIndex()
+            
         self.OnRefresh()
         
     def _OnRelationshipUpdate(self, event_data, relationship):
-        self.OnRelationshipUpdate(Relationship(copy = relationship.contents))
+        if self._index is not None:
+            self._index._Put(Relationship(copy = relationship.contents))
+            
+        if self._views:
+            self.OnRelationshipUpdate(Relationship(internal = relationship.contents))
+        else:
+            self.OnRelationshipUpdate(Relationship(copy = relationship.contents))
         
-    def Filter(self, filter: Callable[[Relationship], None]) -> None:
+    def SetEventViews(self, enabled: bool) -> None:
         """
-        Filters a user's relationship list by a boolean condition.
+        Makes OnRelationshipUpdate receive models backed by the SDK's memory instead of copies.
+        
+        They are only valid until the handler returns: call Detach() on them to keep them.
+        """
+        self._views = enabled
+        
+    def EnableIndex(self) -> RelationshipIndex:
         """
-        def CFilter(filter_data, relationship):
-            return bool(filter(Relationship(copy = relationship.contents)))
+        Keeps an in-memory index of all the relationships, and returns it.
+        
+        The index is seeded now and on every OnRefresh, and updated by OnRelationshipUpdate,
+        so lookups and queries don't call into the SDK. That event only fires for the relationships
+        matching the filter: once Filter() is applied, the others are only updated on OnRefresh.
+        
+        The SDK can't remove a filter: if none was applied, seeding leaves one matching every
+        relationship, which Count and GetAt then reflect.
+        """
+        if self._index is None:
+            self._index = RelationshipIndex()
+            if self._internal:
+                self._SeedIndex()
+                
+        return self._index
+        
+    def GetIndex(self) -> Optional[RelationshipIndex]:
+        """
+        Returns the index kept since EnableIndex(), or None.
+        """
+        return self._index
+        
+    def _SeedIndex(self) -> None:
+        # the index holds every relationship: the filter is lifted while reading them, then restored
+        CFilter = RelationshipFilter()._Compile(self._internal.filter.argtypes[-1])
+        self._internal.filter(self._internal, ctypes.c_void_p(), CFilter)
+        
+        relationships = []
+        for index in range(self.Count()):
+            relationship = sdk.DiscordRelationship()
+            result = Result(self._internal.get_at(self._internal, index, relationship))
+            if result != Result.Ok:
+                raise getException(result)
+                
+            relationships.append(Relationship(internal = relationship))
+            
+        self._index._Reset(relationships)
+        if self._filter is not None:
+            self.Filter(self._filter)
             
-        CFilter = self._internal.filter.argtypes[-1](CFilter)
+    def Filter(self, filter: Union[Callable[[Relationship], bool], RelationshipFilter]) -> None:
+        """
+        Filters a user's relationship list by a boolean condition.
         
+        The condition is either a function, or a RelationshipFilter evaluated without building models.
+        """
+        self._filter = filter
+        
+        if isinstance(filter, RelationshipFilter):
+            CFilter = filter._Compile(self._internal.filter.argtypes[-1])
+        else:
+            def CFilter(filter_data, relationship):
+                return bool(filter(Relationship(copy = relationship.contents)))
+                
+            CFilter = self._internal.filter.argtypes[-1](CFilter)
+            
         self._internal.filter(self._internal, ctypes.c_void_p(), CFilter)
         
     def Get(self, userId: int) -> Relationship:
@@ -65,6 +279,49 @@ class RelationshipManager:
         
         return count.value
             
+    def IterRelationships(self):
+        """
+        Iterates over the relationships matching your filter.
+        
+        One model is reused for every item, it changes on the next step: call Detach() on it to keep it.
+        """
+        internal = self._internal
+        getAt = internal.get_at
+        record = sdk.DiscordRelationship()
+        model = Relationship(internal = record)
+        for index in range(self.Count()):
+            result = getAt(internal, index, record)
+            if result != Result.Ok:
+                raise getException(Result(result))
+                
+            model._Invalidate()
+            yield model
+            
+    def AllRelationships(self) -> list:
+        """
+        Returns the relationships matching your filter, read into a single array.
+        """
+        internal = self._internal
+        getAt = internal.get_at
+        records = (sdk.DiscordRelationship * self.Count())()
+        for index in range(len(records)):
+            result = getAt(internal, index, records[index])
+            if result != Result.Ok:
+                raise getException(Result(result))
+                
+        return [Relationship(internal = record) for record in records]
+        
+    def ToArray(self) -> "numpy.ndarray":
+        """
+        Returns the relationships matching your filter as a NumPy structured array (requires numpy).
+        """
+        def fill(index, record):
+            result = Result(self._internal.get_at(self._internal, index, record))
+            if result != Result.Ok:
+                raise getException(result)
+                
+        return collect(sdk.DiscordRelationship, self.Count(), fill)
+        
     def OnRefresh(self) -> None:
         """
         Fires at initialization when Discord has cached a snapshot of the current status of all your relationships.
@@ -0,0 +1,485 @@
+from . import Discord, sdk
+from .activity import ActivityManager
+from .relationship import RelationshipManager
+from .image import ImageManager
+from .user import UserManager
+from .lobby import LobbyManager
+from .network import NetworkManager
+from .overlay import OverlayManager
+from .application import ApplicationManager
+from .storage import StorageManager
+from .store import StoreManager
+from .voice import VoiceManager
+from .achievement import AchievementManager
+from .enum import LogLevel, CreateFlags
+from .callback import callbackIndex
+from collections import deque
+from typing import Callable, Optional
+import multiprocessing
+import itertools
+import traceback
+import pickle
+import struct
+import time
+
+_managers = {
+    "GetActivityManager": ActivityManager,
+    "GetRelationshipManager": RelationshipManager,
+    "GetImageManager": ImageManager,
+    "GetUserManager": UserManager,
+    "GetLobbyManager": LobbyManager,
+    "GetNetworkManager": NetworkManager,
+    "GetOverlayManager": OverlayManager,
+    "GetApplicationManager": ApplicationManager,
+    "GetStorageManager": StorageManager,
+    "GetStoreManager": StoreManager,
+    "GetVoiceManager": VoiceManager,
+    "GetAchievementManager": AchievementManager
+}
+
+# methods returning objects bound to the native core: they are recorded in
+# the parent and replayed in the host when passed to another method
+_deferred = {
+    "GetLobbyCreateTransaction",
+    "GetLobbyUpdateTransaction",
+    "GetMemberUpdateTransaction",
+    "GetSearchQuery"
+}
+
+class RingBuffer:
+    """
+    Single-producer single-consumer message ring in shared memory.
+    
+    The header holds the total number of bytes written (head) and read (tail);
+    each side only ever writes its own counter, so no lock is needed.
+    """
+    _counter = struct.Struct("Q")
+    _length = struct.Struct("I")
+    _headerSize = 16
+    
+    def __init__(self, memory):
+        self._memory = memory
+        self._buffer = memory.buf
+        self.capacity = memory.size - self._headerSize
+    
+    def _Get(self, offset) -> int:
+        return self._counter.unpack_from(self._buffer, offset)[0]
+    
+    def _Copy(self, position, data) -> None:
+        start = position % self.capacity
+        first = min(len(data), self.capacity - start)
+        base = self._headerSize
+        self._buffer[base + start:base + start + first] = data[:first]
+        self._buffer[base:base + len(data) - first] = data[first:]
+    
+    def _Read(self, position, length) -> bytes:
+        start = position % self.capacity
+        first = min(length, self.capacity - start)
+        base = self._headerSize
+        return bytes(self._buffer[base + start:base + start + first]) + bytes(self._buffer[base:base + length - first])
+    
+    def Put(self, data: bytes) -> bool:
+        """
+        Appends a message. Returns False if the ring is full.
+        """
+        size = self._length.size + len(data)
+        if size > self.capacity:
+            raise ValueError("message of " + str(len(data)) + " bytes does not fit in the ring")
+        
+        head = self._Get(0)
+        if size > self.capacity - (head - self._Get(8)):
+            return False
+        
+        self._Copy(head, self._length.pack(len(data)))
+        self._Copy(head + self._length.size, data)
+        self._counter.pack_into(self._buffer, 0, head + size)
+        return True
+    
+    def Get(self) -> Optional[bytes]:
+        """
+        Pops the oldest message, or returns None if the ring is empty.
+        """
+        tail = self._Get(8)
+        if tail == self._Get(0):
+            return None
+        
+        length = self._length.unpack(self._Read(tail, self._length.size))[0]
+        data = self._Read(tail + self._length.size, length)
+        self._counter.pack_into(self._buffer, 8, tail + self._length.size + length)
+        return data
+    
+    def Release(self) -> None:
+        self._buffer.release()
+        self._memory.close()
+
+def _portable(exception) -> Exception:
+    try:
+        pickle.dumps(exception)
+    except Exception:
+        return RuntimeError(repr(exception))
+    
+    return exception
+
+def _portableArgs(args) -> tuple:
+    # memoryviews (message views...) can't be pickled, the data is sent as bytes
+    return tuple(arg.tobytes() if isinstance(arg, memoryview) else arg for arg in args)
+
+def _put(ring, doorbell, message) -> None:
+    data = pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+    while not ring.Put(data):
+        # the other side is lagging behind, we wait for it to catch up
+        doorbell.set()
+        time.sleep(0.0005)
+    
+    doorbell.set()
+
+class RemoteObject:
+    """
+    Records method calls on a transaction or search query, replayed in the host process.
+    """
+    def __init__(self, getter, method, args):
+        self._getter = getter
+        self._method = method
+        self._args = args
+        self._calls = []
+    
+    def __getattr__(self, key):
+        if key.startswith("_"):
+            raise AttributeError(key)
+        
+        def record(*args):
+            self._calls.append((key, args))
+        
+        return record
+    
+    def _Materialize(self, discord):
+        manager = getattr(discord, self._getter)()
+        obj = getattr(manager, self._method)(*self._args)
+        for key, args in self._calls:
+            getattr(obj, key)(*args)
+        
+        return obj
+
+class RemoteManager:
+    """
+    Client side of a manager living in the host process.
+    
+    Methods keep their usual signatures; synchronous methods block until the host replies.
+    """
+    def __init__(self, discord, getter):
+        object.__setattr__(self, "_discord", discord)
+        object.__setattr__(self, "_getter", getter)
+        object.__setattr__(self, "_class", _managers[getter])
+    
+    def __getattr__(self, key):
+        if key.startswith("On"):
+            # default event handler
+            return lambda *args: None
+        
+        if key.startswith("_") or not callable(getattr(self._class, key, None)):
+            raise AttributeError(key)
+        
+        discord = self._discord
+        getter = self._getter
+        
+        if key in _deferred:
+            def call(*args):
+                return RemoteObject(getter, key, args)
+        
+        else:
+            index = callbackIndex(getattr(self._class, key))
+            
+            def call(*args):
+                if index is not None and len(args) == index + 1:
+                    return discord._Call(getter, key, args[:-1], args[-1])
+                
+                return discord._Call(getter, key, args, None)
+        
+        object.__setattr__(self, key, call)
+        return call
+    
+    def __setattr__(self, key, value):
+        if not key.startswith("On"):
+            raise AttributeError(key)
+        
+        object.__setattr__(self, key, value)
+        self._discord._Send(("subscribe", self._getter, key))
+
+class RemoteDiscord:
+    """
+    Runs a Discord instance in a child process.
+    
+    Events, callbacks and return values are received through a shared-memory ring
+    and dispatched by RunCallbacks; commands are sent through a second ring.
+    Managers keep the same API as with Discord.
+    """
+    def __init__(self, clientId: int, flags: CreateFlags, rate: float = 60, eventRingSize: int = 1 << 20, commandRingSize: int = 1 << 18):
+        from multiprocessing import shared_memory
+        
+        context = multiprocessing.get_context("spawn")
+        
+        self._eventMemory = shared_memory.SharedMemory(create = True, size = eventRingSize + RingBuffer._headerSize)
+        self._commandMemory = shared_memory.SharedMemory(create = True, size = commandRingSize + RingBuffer._headerSize)
+        self._eventMemory.buf[:RingBuffer._headerSize] = bytes(RingBuffer._headerSize)
+        self._commandMemory.buf[:RingBuffer._headerSize] = bytes(RingBuffer._headerSize)
+        
+        self._events = RingBuffer(self._eventMemory)
+        self._commands = RingBuffer(self._commandMemory)
+        self._eventDoorbell = context.Event()
+        self._commandDoorbell = context.Event()
+        
+        self._managers = {}
+        self._callbacks = {}
+        self._counter = itertools.count(1)
+        self._backlog = deque()
+        self._logHook = None
+        
+        self._process = context.Process(
+            target = _host,
+            args = (sdk.library, clientId, flags, rate, self._eventMemory.name, self._commandMemory.name, self._eventDoorbell, self._commandDoorbell),
+            daemon = True
+        )
+        self._process.start()
+        
+        # the host replies to call 0 once the core is created
+        self._Wait(0)
+    
+    def __del__(self):
+        self.Close()
+    
+    def Close(self) -> None:
+        """
+        Stops the host process and releases the shared memory.
+        """
+        if getattr(self, "_process", None) is None:
+            return
+        
+        process, self._process = self._process, None
+        if process.is_alive():
+            self._Send(("stop",))
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+        
+        self._events.Release()
+        self._commands.Release()
+        self._eventMemory.unlink()
+        self._commandMemory.unlink()
+    
+    def _Send(self, message) -> None:
+        _put(self._commands, self._commandDoorbell, message)
+    
+    def _Call(self, getter, method, args, callback):
+        args = _portableArgs(args)
+        
+        if callback is None:
+            callId = next(self._counter)
+            self._Send(("call", callId, getter, method, args, None))
+            return self._Wait(callId)
+        
+        callbackId = next(self._counter)
+        self._callbacks[callbackId] = callback
+        self._Send(("call", None, getter, method, args, callbackId))
+    
+    def _Wait(self, callId):
+        while True:
+            data = self._events.Get()
+            if data is None:
+                if not self._process.is_alive():
+                    raise RuntimeError("the discord host process exited")
+                
+                self._eventDoorbell.wait(0.1)
+                self._eventDoorbell.clear()
+                continue
+            
+            message = pickle.loads(data)
+            if message[0] == "return" and message[1] == callId:
+                return message[2]
+            elif message[0] == "raise" and message[1] == callId:
+                raise message[2]
+            
+            # received while waiting for the reply, dispatched by the next RunCallbacks
+            self._backlog.append(message)
+    
+    def _Dispatch(self, message) -> None:
+        kind = message[0]
+        if kind == "event":
+            getattr(self._GetManager(message[1]), message[2])(*message[3])
+        elif kind == "callback":
+            self._callbacks.pop(message[1])(*message[2])
+        elif kind == "log":
+            if self._logHook:
+                self._logHook(LogLevel(message[1]), message[2])
+        elif kind == "error":
+            raise message[1]
+    
+    def _GetManager(self, getter) -> RemoteManager:
+        manager = self._managers.get(getter)
+        if manager is None:
+            manager = self._managers[getter] = RemoteManager(self, getter)
+        
+        return manager
+    
+    def SetLogHook(self, min_level: LogLevel, hook: Callable[[LogLevel, str], None]) -> None:
+        """
+        Registers a logging callback function with the minimum level of message to receive.
+        """
+        self._logHook = hook
+        self._Send(("hook", min_level.value))
+    
+    def RunCallbacks(self) -> None:
+        """
+        Dispatches the events and callbacks received from the host process.
+        """
+        backlog = self._backlog
+        events = self._events
+        while True:
+            # messages set aside by a synchronous call made from a handler are older than the ring's
+            if backlog:
+                self._Dispatch(backlog.popleft())
+                continue
+            
+            data = events.Get()
+            if data is None:
+                break
+            
+            self._Dispatch(pickle.loads(data))
+    
+    def GetActivityManager(self) -> ActivityManager:
+        return self._GetManager("GetActivityManager")
+    
+    def GetRelationshipManager(self) -> RelationshipManager:
+        return self._GetManager("GetRelationshipManager")
+    
+    def GetImageManager(self) -> ImageManager:
+        return self._GetManager("GetImageManager")
+    
+    def GetUserManager(self) -> UserManager:
+        return self._GetManager("GetUserManager")
+    
+    def GetLobbyManager(self) -> LobbyManager:
+        return self._GetManager("GetLobbyManager")
+    
+    def GetNetworkManager(self) -> NetworkManager:
+        return self._GetManager("GetNetworkManager")
+    
+    def GetOverlayManager(self) -> OverlayManager:
+        return self._GetManager("GetOverlayManager")
+    
+    def GetApplicationManager(self) -> ApplicationManager:
+        return self._GetManager("GetApplicationManager")
+    
+    def GetStorageManager(self) -> StorageManager:
+        return self._GetManager("GetStorageManager")
+    
+    def GetStoreManager(self) -> StoreManager:
+        return self._GetManager("GetStoreManager")
+    
+    def GetVoiceManager(self) -> VoiceManager:
+        return self._GetManager("GetVoiceManager")
+    
+    def GetAchievementManager(self) -> AchievementManager:
+        return self._GetManager("GetAchievementManager")
+
+def _host(library, clientId, flags, rate, eventName, commandName, eventDoorbell, commandDoorbell):
+    from multiprocessing import shared_memory
+    
+    eventMemory = shared_memory.SharedMemory(name = eventName)
+    commandMemory = shared_memory.SharedMemory(name = commandName)
+    events = RingBuffer(eventMemory)
+    commands = RingBuffer(commandMemory)
+    
+    # the host uses the same library as the parent
+    sdk.library = library
+    
+    def post(*message):
+        _put(events, eventDoorbell, message)
+    
+    try:
+        discord = Discord(clientId, flags)
+    except Exception as exception:
+        post("raise", 0, _portable(exception))
+        return
+    
+    post("return", 0, None)
+    
+    def forwardEvent(getter, key):
+        return lambda *args: post("event", getter, key, _portableArgs(args))
+    
+    def forwardCallback(callbackId):
+        return lambda *args: post("callback", callbackId, _portableArgs(args))
+    
+    def materialize(value):
+        if isinstance(value, RemoteObject):
+            return value._Materialize(discord)
+        
+        return value
+    
+    running = True
+    interval = 1 / rate
+    nextTick = time.perf_counter()
+    
+    while running:
+        while True:
+            data = commands.Get()
+            if data is None:
+                break
+            
+            message = pickle.loads(data)
+            kind = message[0]
+            
+            if kind == "call":
+                _, callId, getter, method, args, callbackId = message
+                args = [materialize(arg) for arg in args]
+                if callbackId is not None:
+                    args.append(forwardCallback(callbackId))
+                
+                try:
+                    value = getattr(getattr(discord, getter)(), method)(*args)
+                except Exception as exception:
+                    if callId is None:
+                        post("error", _portable(exception))
+                    else:
+                        post("raise", callId, _portable(exception))
+                else:
+                    if callId is not None:
+                        # memoryviews (GetData with the cache enabled...) can't be pickled, the data is sent as bytes
+                        if isinstance(value, memoryview):
+                            value = value.tobytes()
+                            
+                        try:
+                            post("return", callId, value)
+                        except Exception as exception:
+                            # values that can't be pickled (generators...) are raised in the parent instead
+                            post("raise", callId, _portable(exception))
+            
+            elif kind == "subscribe":
+                _, getter, key = message
+                setattr(getattr(discord, getter)(), key, forwardEvent(getter, key))
+            
+            elif kind == "hook":
+                discord.SetLogHook(LogLevel(message[1]), lambda level, text: post("log", level.value, text))
+            
+            elif kind == "stop":
+                running = False
+        
+        if not running:
+            break
+        
+        now = time.perf_counter()
+        if now >= nextTick:
+            try:
+                discord.RunCallbacks()
+            except Exception as exception:
+                post("error", _portable(exception))
+                traceback.print_exc()
+                break
+            
+            nextTick = now + interval
+        
+        commandDoorbell.wait(max(nextTick - time.perf_counter(), 0))
+        commandDoorbell.clear()
+    
+    del discord
+    events.Release()
+    commands.Release()
@@ -533,8 +533,35 @@ def DiscordCreateParamsSetDefault(params):
 
 
 
-dll = CDLL(os.path.abspath("discord_game_sdk"))
-DiscordCreate = dll.DiscordCreate 
-DiscordCreate.argtypes = (DiscordVersion, POINTER(DiscordCreateParams), POINTER(POINTER(IDiscordCore)))
-DiscordCreate.restype = c_int32
+# DISCORD_GAME_SDK can point to another library, or be "standin" for the pure-Python core
+library = os.environ.get("DISCORD_GAME_SDK", "discord_game_sdk")
 
+_DiscordCreate = None
+
+def LoadLibrary(path = None):
+    """
+    Loads the SDK library (or the pure-Python stand-in if path is "standin").
+    
+    This is done by the first DiscordCreate call if it wasn't called before.
+    """
+    global library, _DiscordCreate
+    
+    if path is not None:
+        library = path
+        
+    if library == "standin":
+        from .standin import DiscordCreate as create
+        
+    else:
+        dll = CDLL(os.path.abspath(library))
+        create = dll.DiscordCreate
+        create.argtypes = (DiscordVersion, POINTER(DiscordCreateParams), POINTER(POINTER(IDiscordCore)))
+        create.restype = c_int32
+        
+    _DiscordCreate = create
+    
+def DiscordCreate(version, params, core):
+    if _DiscordCreate is None:
+        LoadLibrary()
+        
+    return _DiscordCreate(version, params, core)
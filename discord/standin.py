@@ -0,0 +1,1000 @@
+"""
+Pure-Python stand-in for the discord_game_sdk library.
+
+Every vtable defined in sdk.py is implemented with ctypes callbacks, so the
+bindings run exactly as they would against the real core. Set the
+DISCORD_GAME_SDK environment variable to "standin" before importing discord
+to use it.
+"""
+from . import sdk
+from .enum import Result, RelationshipType, Status, LobbyType, SkuType, EntitlementType, InputModeType
+from ctypes import *
+import ctypes
+import random
+
+class StandInConfig:
+    """
+    Settings used by the next created core.
+    
+    rates maps an event name to the number of events synthesized per
+    RunCallbacks (fractions accumulate across ticks). Event names are:
+    relationship_refresh, relationship_update, current_user_update,
+    activity_invite, lobby_update, member_update, lobby_message, speaking,
+    lobby_network_message, network_message, route_update, entitlement_create,
+    user_achievement_update, settings_update.
+    """
+    def __init__(self):
+        self.seed = 0
+        self.relationships = 100
+        self.lobbies = 4
+        self.lobbyMembers = 8
+        self.lobbyMetadata = 4
+        self.files = 8
+        self.skus = 4
+        self.entitlements = 4
+        self.achievements = 8
+        self.messageSize = 64
+        self.imageSize = 64
+        self.loopback = True
+        self.rates = {}
+
+config = StandInConfig()
+
+# cores created by DiscordCreate and not destroyed yet
+cores = []
+
+def _implement(ftype, func):
+    # arrays are passed by pointer, and callbacks can't return pointers:
+    # we declare both as pointers / addresses and cast to the vtable type
+    argtypes = [POINTER(argtype) if issubclass(argtype, Array) else argtype for argtype in ftype._argtypes_]
+    arrays = [index for index, argtype in enumerate(ftype._argtypes_) if issubclass(argtype, Array)]
+    restype = ftype._restype_
+    pointerResult = restype is not None and issubclass(restype, ctypes._Pointer)
+    
+    def wrapper(*args):
+        if arrays:
+            args = list(args)
+            for index in arrays:
+                args[index] = args[index].contents
+        
+        result = func(*args)
+        if pointerResult:
+            return addressof(result)
+        
+        return result
+    
+    thunk = CFUNCTYPE(c_void_p if pointerResult else restype, *argtypes)(wrapper)
+    return cast(thunk, ftype), thunk
+
+def _default(ftype):
+    if ftype._restype_ is c_int32:
+        return lambda *args: Result.Ok
+    
+    return lambda *args: None
+
+def _vtable(structure, impl):
+    """
+    Builds a vtable structure from the methods of impl named after its fields.
+    """
+    table = structure()
+    impl._thunks = []
+    for name, ftype in structure._fields_:
+        func = getattr(impl, name, None) or _default(ftype)
+        pointer, thunk = _implement(ftype, func)
+        setattr(table, name, pointer)
+        impl._thunks.append(thunk)
+    
+    return table
+
+def _events(pointer):
+    # events structures are passed as pointers, some of them are void pointers
+    if not pointer:
+        return None
+    
+    return pointer.contents
+
+def _store(pointer, value) -> None:
+    memmove(pointer, byref(value), sizeof(value))
+
+class _Base:
+    def __init__(self, core):
+        self.core = core
+        self.rng = core.rng
+    
+    def _Later(self, callback, *args):
+        self.core.pending.append((callback, args))
+
+class StandInApplicationManager(_Base):
+    def validate_or_exit(self, manager, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def get_current_locale(self, manager, locale):
+        locale.contents.value = b"en-US"
+    
+    def get_current_branch(self, manager, branch):
+        branch.contents.value = b"master"
+    
+    def get_oauth2_token(self, manager, callback_data, callback):
+        token = sdk.DiscordOAuth2Token()
+        token.access_token = b"standin-access-token"
+        token.scopes = b"identify"
+        token.expires = 3600
+        self._Later(callback, callback_data, Result.Ok, pointer(token))
+    
+    def get_ticket(self, manager, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok, b"standin-ticket")
+
+class StandInUserManager(_Base):
+    def __init__(self, core):
+        super().__init__(core)
+        self.currentUser = core.MakeUser(1)
+    
+    def get_current_user(self, manager, user):
+        _store(user, self.currentUser)
+        return Result.Ok
+    
+    def get_user(self, manager, user_id, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok, pointer(self.core.MakeUser(user_id)))
+    
+    def get_current_user_premium_type(self, manager, premium_type):
+        premium_type[0] = 0
+        return Result.Ok
+    
+    def current_user_has_flag(self, manager, flag, has_flag):
+        has_flag[0] = False
+        return Result.Ok
+
+class StandInImageManager(_Base):
+    def fetch(self, manager, handle, refresh, callback_data, callback):
+        result = sdk.DiscordImageHandle()
+        result.type = handle.type
+        result.id = handle.id
+        result.size = handle.size or config.imageSize
+        self._Later(callback, callback_data, Result.Ok, result)
+    
+    def get_dimensions(self, manager, handle, dimensions):
+        dimensions[0] = sdk.DiscordImageDimensions(handle.size, handle.size)
+        return Result.Ok
+    
+    def get_data(self, manager, handle, data, data_length):
+        if data_length < handle.size * handle.size * 4:
+            return Result.InsufficientBuffer
+        
+        # deterministic pixels, derived from the user id
+        pixel = (handle.id & 0xFFFFFF).to_bytes(3, "little") + b"\xff"
+        memmove(data, pixel * (handle.size * handle.size), handle.size * handle.size * 4)
+        return Result.Ok
+
+class StandInActivityManager(_Base):
+    def register_command(self, manager, command):
+        return Result.Ok
+    
+    def register_steam(self, manager, steam_id):
+        return Result.Ok
+    
+    def update_activity(self, manager, activity, callback_data, callback):
+        self.activity = sdk.DiscordActivity()
+        _store(byref(self.activity), activity.contents)
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def clear_activity(self, manager, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def send_request_reply(self, manager, user_id, reply, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def send_invite(self, manager, user_id, type, content, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def accept_invite(self, manager, user_id, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+
+class StandInRelationshipManager(_Base):
+    def __init__(self, core):
+        super().__init__(core)
+        self.relationships = [core.MakeRelationship(1000 + index) for index in range(config.relationships)]
+        self.filtered = list(self.relationships)
+    
+    def filter(self, manager, filter_data, filter):
+        self.filtered = [relationship for relationship in self.relationships if filter(filter_data, pointer(relationship))]
+    
+    def count(self, manager, count):
+        count[0] = len(self.filtered)
+        return Result.Ok
+    
+    def get(self, manager, user_id, relationship):
+        for item in self.relationships:
+            if item.user.id == user_id:
+                _store(relationship, item)
+                return Result.Ok
+        
+        return Result.NotFound
+    
+    def get_at(self, manager, index, relationship):
+        if not 0 <= index < len(self.filtered):
+            return Result.NotFound
+        
+        _store(relationship, self.filtered[index])
+        return Result.Ok
+
+class _Transaction(_Base):
+    def __init__(self, core, structure):
+        super().__init__(core)
+        self.changes = {}
+        self.metadata = {}
+        self.table = _vtable(structure, self)
+    
+    def set_type(self, transaction, type):
+        self.changes["type"] = type
+        return Result.Ok
+    
+    def set_owner(self, transaction, owner_id):
+        self.changes["owner_id"] = owner_id
+        return Result.Ok
+    
+    def set_capacity(self, transaction, capacity):
+        self.changes["capacity"] = capacity
+        return Result.Ok
+    
+    def set_locked(self, transaction, locked):
+        self.changes["locked"] = locked
+        return Result.Ok
+    
+    def set_metadata(self, transaction, key, value):
+        self.metadata[key.value] = value.value
+        return Result.Ok
+    
+    def delete_metadata(self, transaction, key):
+        self.metadata[key.value] = None
+        return Result.Ok
+
+class _SearchQuery(_Base):
+    def __init__(self, core):
+        super().__init__(core)
+        self.count = None
+        self.table = _vtable(sdk.IDiscordLobbySearchQuery, self)
+    
+    def limit(self, query, limit):
+        self.count = limit
+        return Result.Ok
+
+class _Lobby:
+    def __init__(self, lobby):
+        self.lobby = lobby
+        self.metadata = {}
+        self.members = {}
+
+class StandInLobbyManager(_Base):
+    def __init__(self, core):
+        super().__init__(core)
+        self.lobbies = {}
+        self.results = []
+        self.nextId = 1
+        self.transactions = {}
+        
+        for index in range(config.lobbies):
+            self._Create({"type": LobbyType.Public, "capacity": config.lobbyMembers * 2}, {})
+    
+    def _Create(self, changes, metadata) -> _Lobby:
+        lobby = sdk.DiscordLobby()
+        lobby.id = self.nextId
+        lobby.type = changes.get("type", LobbyType.Private)
+        lobby.owner_id = changes.get("owner_id", 1)
+        lobby.secret = ("secret%d" % self.nextId).encode("utf8")
+        lobby.capacity = changes.get("capacity", 16)
+        lobby.locked = changes.get("locked", False)
+        self.nextId += 1
+        
+        entry = self.lobbies[lobby.id] = _Lobby(lobby)
+        for index in range(config.lobbyMetadata):
+            entry.metadata[("key%d" % index).encode("utf8")] = ("value%d" % index).encode("utf8")
+        
+        self._Apply(entry.metadata, metadata)
+        for index in range(config.lobbyMembers):
+            entry.members[1 + index] = {}
+        
+        return entry
+    
+    def _Apply(self, target, metadata) -> None:
+        for key, value in metadata.items():
+            if value is None:
+                target.pop(key, None)
+            else:
+                target[key] = value
+    
+    def _Transaction(self, structure, output):
+        transaction = _Transaction(self.core, structure)
+        self.transactions[addressof(transaction.table)] = transaction
+        output[0] = pointer(transaction.table)
+        return Result.Ok
+    
+    def _PopTransaction(self, pointer) -> _Transaction:
+        return self.transactions.pop(addressof(pointer.contents))
+    
+    def get_lobby_create_transaction(self, manager, transaction):
+        return self._Transaction(sdk.IDiscordLobbyTransaction, transaction)
+    
+    def get_lobby_update_transaction(self, manager, lobby_id, transaction):
+        if lobby_id not in self.lobbies:
+            return Result.NotFound
+        
+        return self._Transaction(sdk.IDiscordLobbyTransaction, transaction)
+    
+    def get_member_update_transaction(self, manager, lobby_id, user_id, transaction):
+        if lobby_id not in self.lobbies:
+            return Result.NotFound
+        
+        return self._Transaction(sdk.IDiscordLobbyMemberTransaction, transaction)
+    
+    def create_lobby(self, manager, transaction, callback_data, callback):
+        transaction = self._PopTransaction(transaction)
+        entry = self._Create(transaction.changes, transaction.metadata)
+        self._Later(callback, callback_data, Result.Ok, pointer(entry.lobby))
+    
+    def update_lobby(self, manager, lobby_id, transaction, callback_data, callback):
+        transaction = self._PopTransaction(transaction)
+        entry = self.lobbies.get(lobby_id)
+        if entry is None:
+            self._Later(callback, callback_data, Result.NotFound)
+            return
+        
+        for key, value in transaction.changes.items():
+            setattr(entry.lobby, key, value)
+        
+        self._Apply(entry.metadata, transaction.metadata)
+        self._Later(callback, callback_data, Result.Ok)
+        self.core.Emit("lobby", "on_lobby_update", lobby_id)
+    
+    def delete_lobby(self, manager, lobby_id, callback_data, callback):
+        result = Result.Ok if self.lobbies.pop(lobby_id, None) else Result.NotFound
+        self._Later(callback, callback_data, result)
+    
+    def connect_lobby(self, manager, lobby_id, secret, callback_data, callback):
+        entry = self.lobbies.get(lobby_id)
+        if entry is None:
+            self._Later(callback, callback_data, Result.NotFound, None)
+        elif entry.lobby.secret != secret.value:
+            self._Later(callback, callback_data, Result.InvalidSecret, None)
+        else:
+            self._Later(callback, callback_data, Result.Ok, pointer(entry.lobby))
+    
+    def connect_lobby_with_activity_secret(self, manager, secret, callback_data, callback):
+        lobbyId, _, lobbySecret = secret.value.partition(b":")
+        entry = self.lobbies.get(int(lobbyId)) if lobbyId.isdigit() else None
+        if entry is None or entry.lobby.secret != lobbySecret:
+            self._Later(callback, callback_data, Result.InvalidSecret, None)
+        else:
+            self._Later(callback, callback_data, Result.Ok, pointer(entry.lobby))
+    
+    def disconnect_lobby(self, manager, lobby_id, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def get_lobby(self, manager, lobby_id, lobby):
+        entry = self.lobbies.get(lobby_id)
+        if entry is None:
+            return Result.NotFound
+        
+        _store(lobby, entry.lobby)
+        return Result.Ok
+    
+    def get_lobby_activity_secret(self, manager, lobby_id, secret):
+        entry = self.lobbies.get(lobby_id)
+        if entry is None:
+            return Result.NotFound
+        
+        secret.contents.value = str(lobby_id).encode("utf8") + b":" + entry.lobby.secret
+        return Result.Ok
+    
+    def get_lobby_metadata_value(self, manager, lobby_id, key, value):
+        entry = self.lobbies.get(lobby_id)
+        if entry is None or key.value not in entry.metadata:
+            return Result.NotFound
+        
+        value.contents.value = entry.metadata[key.value]
+        return Result.Ok
+    
+    def get_lobby_metadata_key(self, manager, lobby_id, index, key):
+        entry = self.lobbies.get(lobby_id)
+        if entry is None or not 0 <= index < len(entry.metadata):
+            return Result.NotFound
+        
+        key.contents.value = list(entry.metadata)[index]
+        return Result.Ok
+    
+    def lobby_metadata_count(self, manager, lobby_id, count):
+        entry = self.lobbies.get(lobby_id)
+        if entry is None:
+            return Result.NotFound
+        
+        count[0] = len(entry.metadata)
+        return Result.Ok
+    
+    def member_count(self, manager, lobby_id, count):
+        entry = self.lobbies.get(lobby_id)
+        if entry is None:
+            return Result.NotFound
+        
+        count[0] = len(entry.members)
+        return Result.Ok
+    
+    def get_member_user_id(self, manager, lobby_id, index, user_id):
+        entry = self.lobbies.get(lobby_id)
+        if entry is None or not 0 <= index < len(entry.members):
+            return Result.NotFound
+        
+        user_id[0] = list(entry.members)[index]
+        return Result.Ok
+    
+    def get_member_user(self, manager, lobby_id, user_id, user):
+        entry = self.lobbies.get(lobby_id)
+        if entry is None or user_id not in entry.members:
+            return Result.NotFound
+        
+        _store(user, self.core.MakeUser(user_id))
+        return Result.Ok
+    
+    def get_member_metadata_value(self, manager, lobby_id, user_id, key, value):
+        entry = self.lobbies.get(lobby_id)
+        metadata = entry.members.get(user_id, {}) if entry else {}
+        if key.value not in metadata:
+            return Result.NotFound
+        
+        value.contents.value = metadata[key.value]
+        return Result.Ok
+    
+    def get_member_metadata_key(self, manager, lobby_id, user_id, index, key):
+        entry = self.lobbies.get(lobby_id)
+        metadata = entry.members.get(user_id, {}) if entry else {}
+        if not 0 <= index < len(metadata):
+            return Result.NotFound
+        
+        key.contents.value = list(metadata)[index]
+        return Result.Ok
+    
+    def member_metadata_count(self, manager, lobby_id, user_id, count):
+        entry = self.lobbies.get(lobby_id)
+        if entry is None or user_id not in entry.members:
+            return Result.NotFound
+        
+        count[0] = len(entry.members[user_id])
+        return Result.Ok
+    
+    def update_member(self, manager, lobby_id, user_id, transaction, callback_data, callback):
+        transaction = self._PopTransaction(transaction)
+        entry = self.lobbies.get(lobby_id)
+        if entry is None or user_id not in entry.members:
+            self._Later(callback, callback_data, Result.NotFound)
+            return
+        
+        self._Apply(entry.members[user_id], transaction.metadata)
+        self._Later(callback, callback_data, Result.Ok)
+        self.core.Emit("lobby", "on_member_update", lobby_id, user_id)
+    
+    def send_lobby_message(self, manager, lobby_id, data, data_length, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+        if config.loopback:
+            message = (c_uint8 * data_length).from_buffer_copy(string_at(data, data_length))
+            self.core.Emit("lobby", "on_lobby_message", lobby_id, 1, message, data_length)
+    
+    def get_search_query(self, manager, query):
+        search = _SearchQuery(self.core)
+        self.transactions[addressof(search.table)] = search
+        query[0] = pointer(search.table)
+        return Result.Ok
+    
+    def search(self, manager, query, callback_data, callback):
+        search = self._PopTransaction(query)
+        self.results = list(self.lobbies)[:search.count]
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def lobby_count(self, manager, count):
+        count[0] = len(self.results)
+    
+    def get_lobby_id(self, manager, index, lobby_id):
+        if not 0 <= index < len(self.results):
+            return Result.NotFound
+        
+        lobby_id[0] = self.results[index]
+        return Result.Ok
+    
+    def connect_voice(self, manager, lobby_id, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def disconnect_voice(self, manager, lobby_id, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def send_network_message(self, manager, lobby_id, user_id, channel_id, data, data_length):
+        if config.loopback:
+            message = (c_uint8 * data_length).from_buffer_copy(string_at(data, data_length))
+            self.core.Emit("lobby", "on_network_message", lobby_id, 1, channel_id, message, data_length)
+        
+        return Result.Ok
+
+class StandInNetworkManager(_Base):
+    peerId = 1
+    
+    def get_peer_id(self, manager, peer_id):
+        peer_id[0] = self.peerId
+    
+    def send_message(self, manager, peer_id, channel_id, data, data_length):
+        if config.loopback:
+            message = (c_uint8 * data_length).from_buffer_copy(string_at(data, data_length))
+            self.core.Emit("network", "on_message", self.peerId, channel_id, message, data_length)
+        
+        return Result.Ok
+
+class StandInOverlayManager(_Base):
+    def is_enabled(self, manager, enabled):
+        enabled[0] = True
+    
+    def is_locked(self, manager, locked):
+        locked[0] = True
+    
+    def set_locked(self, manager, locked, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+        self.core.Emit("overlay", "on_toggle", locked)
+    
+    def open_activity_invite(self, manager, type, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def open_guild_invite(self, manager, code, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def open_voice_settings(self, manager, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def is_point_inside_click_zone(self, manager, x, y):
+        return False
+
+class StandInStorageManager(_Base):
+    def __init__(self, core):
+        super().__init__(core)
+        self.files = {}
+        for index in range(config.files):
+            self.files[("file%d" % index).encode("utf8")] = bytes(self.rng.getrandbits(8) for _ in range(256))
+    
+    def read(self, manager, name, data, data_length, read):
+        content = self.files.get(name)
+        if content is None:
+            return Result.NotFound
+        
+        length = min(len(content), data_length)
+        memmove(data, content, length)
+        read[0] = length
+        return Result.Ok if length == len(content) else Result.InsufficientBuffer
+    
+    def _ReadLater(self, content, callback, callback_data):
+        if content is None:
+            self._Later(callback, callback_data, Result.NotFound, None, 0)
+        else:
+            buffer = (c_uint8 * len(content)).from_buffer_copy(content)
+            self._Later(callback, callback_data, Result.Ok, buffer, len(content))
+    
+    def read_async(self, manager, name, callback_data, callback):
+        self._ReadLater(self.files.get(name), callback, callback_data)
+    
+    def read_async_partial(self, manager, name, offset, length, callback_data, callback):
+        content = self.files.get(name)
+        self._ReadLater(content and content[offset:offset + length], callback, callback_data)
+    
+    def write(self, manager, name, data, data_length):
+        self.files[name] = string_at(data, data_length)
+        return Result.Ok
+    
+    def write_async(self, manager, name, data, data_length, callback_data, callback):
+        self.files[name] = string_at(data, data_length)
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def delete_(self, manager, name):
+        return Result.Ok if self.files.pop(name, None) is not None else Result.NotFound
+    
+    def exists(self, manager, name, exists):
+        exists[0] = name in self.files
+        return Result.Ok
+    
+    def count(self, manager, count):
+        count[0] = len(self.files)
+    
+    def _Stat(self, name, stat):
+        result = sdk.DiscordFileStat()
+        result.filename = name
+        result.size = len(self.files[name])
+        result.last_modified = 1600000000
+        _store(stat, result)
+        return Result.Ok
+    
+    def stat(self, manager, name, stat):
+        if name not in self.files:
+            return Result.NotFound
+        
+        return self._Stat(name, stat)
+    
+    def stat_at(self, manager, index, stat):
+        if not 0 <= index < len(self.files):
+            return Result.NotFound
+        
+        return self._Stat(list(self.files)[index], stat)
+    
+    def get_path(self, manager, path):
+        path.contents.value = b"/tmp/discord-standin"
+        return Result.Ok
+
+class StandInStoreManager(_Base):
+    def __init__(self, core):
+        super().__init__(core)
+        self.skus = []
+        for index in range(config.skus):
+            sku = sdk.DiscordSku()
+            sku.id = 500 + index
+            sku.type = SkuType.DLC
+            sku.name = ("sku%d" % index).encode("utf8")
+            sku.price.amount = 499
+            sku.price.currency = b"USD"
+            self.skus.append(sku)
+        
+        self.entitlements = [core.MakeEntitlement(index) for index in range(config.entitlements)]
+    
+    def fetch_skus(self, manager, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def count_skus(self, manager, count):
+        count[0] = len(self.skus)
+    
+    def get_sku(self, manager, sku_id, sku):
+        for item in self.skus:
+            if item.id == sku_id:
+                _store(sku, item)
+                return Result.Ok
+        
+        return Result.NotFound
+    
+    def get_sku_at(self, manager, index, sku):
+        if not 0 <= index < len(self.skus):
+            return Result.NotFound
+        
+        _store(sku, self.skus[index])
+        return Result.Ok
+    
+    def fetch_entitlements(self, manager, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def count_entitlements(self, manager, count):
+        count[0] = len(self.entitlements)
+    
+    def get_entitlement(self, manager, entitlement_id, entitlement):
+        for item in self.entitlements:
+            if item.id == entitlement_id:
+                _store(entitlement, item)
+                return Result.Ok
+        
+        return Result.NotFound
+    
+    def get_entitlement_at(self, manager, index, entitlement):
+        if not 0 <= index < len(self.entitlements):
+            return Result.NotFound
+        
+        _store(entitlement, self.entitlements[index])
+        return Result.Ok
+    
+    def has_sku_entitlement(self, manager, sku_id, has_entitlement):
+        has_entitlement[0] = any(item.sku_id == sku_id for item in self.entitlements)
+        return Result.Ok
+    
+    def start_purchase(self, manager, sku_id, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+
+class StandInVoiceManager(_Base):
+    def __init__(self, core):
+        super().__init__(core)
+        self.inputMode = sdk.DiscordInputMode(InputModeType.VoiceActivity, b"")
+        self.selfMute = False
+        self.selfDeaf = False
+        self.localMutes = {}
+        self.localVolumes = {}
+    
+    def get_input_mode(self, manager, input_mode):
+        _store(input_mode, self.inputMode)
+        return Result.Ok
+    
+    def set_input_mode(self, manager, input_mode, callback_data, callback):
+        _store(byref(self.inputMode), input_mode)
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def is_self_mute(self, manager, mute):
+        mute[0] = self.selfMute
+        return Result.Ok
+    
+    def set_self_mute(self, manager, mute):
+        self.selfMute = mute
+        return Result.Ok
+    
+    def is_self_deaf(self, manager, deaf):
+        deaf[0] = self.selfDeaf
+        return Result.Ok
+    
+    def set_self_deaf(self, manager, deaf):
+        self.selfDeaf = deaf
+        return Result.Ok
+    
+    def is_local_mute(self, manager, user_id, mute):
+        mute[0] = self.localMutes.get(user_id, False)
+        return Result.Ok
+    
+    def set_local_mute(self, manager, user_id, mute):
+        self.localMutes[user_id] = mute
+        return Result.Ok
+    
+    def get_local_volume(self, manager, user_id, volume):
+        volume[0] = self.localVolumes.get(user_id, 100)
+        return Result.Ok
+    
+    def set_local_volume(self, manager, user_id, volume):
+        self.localVolumes[user_id] = volume
+        return Result.Ok
+
+class StandInAchievementManager(_Base):
+    def __init__(self, core):
+        super().__init__(core)
+        self.achievements = [core.MakeUserAchievement(index) for index in range(config.achievements)]
+    
+    def set_user_achievement(self, manager, achievement_id, percent_complete, callback_data, callback):
+        for item in self.achievements:
+            if item.achievement_id == achievement_id:
+                item.percent_complete = percent_complete
+                self.core.Emit("achievement", "on_user_achievement_update", pointer(item))
+                break
+        
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def fetch_user_achievements(self, manager, callback_data, callback):
+        self._Later(callback, callback_data, Result.Ok)
+    
+    def count_user_achievements(self, manager, count):
+        count[0] = len(self.achievements)
+    
+    def get_user_achievement(self, manager, achievement_id, achievement):
+        for item in self.achievements:
+            if item.achievement_id == achievement_id:
+                _store(achievement, item)
+                return Result.Ok
+        
+        return Result.NotFound
+    
+    def get_user_achievement_at(self, manager, index, achievement):
+        if not 0 <= index < len(self.achievements):
+            return Result.NotFound
+        
+        _store(achievement, self.achievements[index])
+        return Result.Ok
+
+class StandInCore:
+    """
+    A stand-in IDiscordCore. Callbacks and events run from run_callbacks, like with the real core.
+    """
+    def __init__(self, params):
+        self.rng = random.Random(config.seed)
+        self.pending = []
+        self.ticks = 0
+        self.logHook = None
+        self._credit = {}
+        
+        self.eventData = params.event_data
+        self.events = {
+            "user": _events(params.user_events),
+            "activity": _events(params.activity_events),
+            "relationship": _events(params.relationship_events),
+            "lobby": _events(params.lobby_events),
+            "network": _events(params.network_events),
+            "overlay": _events(params.overlay_events),
+            "store": _events(params.store_events),
+            "voice": _events(params.voice_events),
+            "achievement": _events(params.achievement_events)
+        }
+        
+        self.application = StandInApplicationManager(self)
+        self.user = StandInUserManager(self)
+        self.image = StandInImageManager(self)
+        self.activity = StandInActivityManager(self)
+        self.relationship = StandInRelationshipManager(self)
+        self.lobby = StandInLobbyManager(self)
+        self.network = StandInNetworkManager(self)
+        self.overlay = StandInOverlayManager(self)
+        self.storage = StandInStorageManager(self)
+        self.store = StandInStoreManager(self)
+        self.voice = StandInVoiceManager(self)
+        self.achievement = StandInAchievementManager(self)
+        
+        self.tables = {}
+        for name, structure in (
+            ("application", sdk.IDiscordApplicationManager),
+            ("user", sdk.IDiscordUserManager),
+            ("image", sdk.IDiscordImageManager),
+            ("activity", sdk.IDiscordActivityManager),
+            ("relationship", sdk.IDiscordRelationshipManager),
+            ("lobby", sdk.IDiscordLobbyManager),
+            ("network", sdk.IDiscordNetworkManager),
+            ("overlay", sdk.IDiscordOverlayManager),
+            ("storage", sdk.IDiscordStorageManager),
+            ("store", sdk.IDiscordStoreManager),
+            ("voice", sdk.IDiscordVoiceManager),
+            ("achievement", sdk.IDiscordAchievementManager)
+        ):
+            self.tables[name] = _vtable(structure, getattr(self, name))
+        
+        self.table = _vtable(sdk.IDiscordCore, self)
+    
+    # data factories
+    
+    def MakeUser(self, userId: int) -> sdk.DiscordUser:
+        user = sdk.DiscordUser()
+        user.id = userId
+        user.username = ("user%d" % userId).encode("utf8")
+        user.discriminator = ("%04d" % (userId % 10000)).encode("utf8")
+        user.avatar = ("avatar%d" % userId).encode("utf8")
+        return user
+    
+    def MakeRelationship(self, userId: int) -> sdk.DiscordRelationship:
+        rng = self.rng
+        relationship = sdk.DiscordRelationship()
+        relationship.type = rng.choice((RelationshipType.Friend,) * 6 + (RelationshipType.Blocked, RelationshipType.PendingIncoming, RelationshipType.PendingOutgoing, RelationshipType.Implicit))
+        relationship.user = self.MakeUser(userId)
+        self.UpdatePresence(relationship)
+        return relationship
+    
+    def UpdatePresence(self, relationship) -> None:
+        rng = self.rng
+        presence = relationship.presence
+        presence.status = rng.choice((Status.Offline, Status.Online, Status.Idle, Status.DoNotDisturb))
+        if presence.status != Status.Offline and rng.random() < 0.5:
+            presence.activity.application_id = rng.randrange(1, 100)
+            presence.activity.name = ("game%d" % presence.activity.application_id).encode("utf8")
+            presence.activity.state = b"In a match"
+            presence.activity.party.size.current_size = rng.randrange(1, 5)
+            presence.activity.party.size.max_size = 4
+        else:
+            presence.activity = sdk.DiscordActivity()
+    
+    def MakeEntitlement(self, index: int) -> sdk.DiscordEntitlement:
+        entitlement = sdk.DiscordEntitlement()
+        entitlement.id = 700 + index
+        entitlement.type = EntitlementType.Purchase
+        entitlement.sku_id = 500 + index % max(config.skus, 1)
+        return entitlement
+    
+    def MakeUserAchievement(self, index: int) -> sdk.DiscordUserAchievement:
+        achievement = sdk.DiscordUserAchievement()
+        achievement.user_id = 1
+        achievement.achievement_id = 900 + index
+        achievement.percent_complete = self.rng.randrange(0, 101)
+        achievement.unlocked_at = b"2020-01-01T00:00:00Z"
+        return achievement
+    
+    def MakeMessage(self):
+        size = config.messageSize
+        data = (c_uint8 * size).from_buffer_copy(bytes(self.rng.getrandbits(8) for _ in range(size)))
+        return data, size
+    
+    # events
+    
+    def Emit(self, events: str, name: str, *args) -> None:
+        """
+        Queues an event, fired by the next run_callbacks.
+        """
+        table = self.events[events]
+        if table is not None:
+            self.pending.append((getattr(table, name), (self.eventData,) + args))
+    
+    def _Synthesize(self, name: str) -> None:
+        rng = self.rng
+        lobbies = list(self.lobby.lobbies)
+        lobbyId = rng.choice(lobbies) if lobbies else 0
+        
+        if name == "relationship_refresh":
+            self.Emit("relationship", "on_refresh")
+        elif name == "relationship_update":
+            if self.relationship.relationships:
+                relationship = rng.choice(self.relationship.relationships)
+                self.UpdatePresence(relationship)
+                self.Emit("relationship", "on_relationship_update", pointer(relationship))
+        elif name == "current_user_update":
+            self.Emit("user", "on_current_user_update")
+        elif name == "activity_invite":
+            activity = sdk.DiscordActivity()
+            activity.name = b"game"
+            self.Emit("activity", "on_activity_invite", 1, pointer(self.MakeUser(rng.randrange(2, 1 << 32))), pointer(activity))
+        elif name == "lobby_update":
+            self.Emit("lobby", "on_lobby_update", lobbyId)
+        elif name == "member_update":
+            self.Emit("lobby", "on_member_update", lobbyId, rng.randrange(1, config.lobbyMembers + 1))
+        elif name == "lobby_message":
+            data, size = self.MakeMessage()
+            self.Emit("lobby", "on_lobby_message", lobbyId, 2, data, size)
+        elif name == "speaking":
+            self.Emit("lobby", "on_speaking", lobbyId, 2, rng.random() < 0.5)
+        elif name == "lobby_network_message":
+            data, size = self.MakeMessage()
+            self.Emit("lobby", "on_network_message", lobbyId, 2, 0, data, size)
+        elif name == "network_message":
+            data, size = self.MakeMessage()
+            self.Emit("network", "on_message", 2, 0, data, size)
+        elif name == "route_update":
+            self.Emit("network", "on_route_update", b"{\"route\": \"standin\"}")
+        elif name == "entitlement_create":
+            entitlement = self.MakeEntitlement(len(self.store.entitlements))
+            self.store.entitlements.append(entitlement)
+            self.Emit("store", "on_entitlement_create", pointer(entitlement))
+        elif name == "user_achievement_update":
+            if self.achievement.achievements:
+                self.Emit("achievement", "on_user_achievement_update", pointer(rng.choice(self.achievement.achievements)))
+        elif name == "settings_update":
+            self.Emit("voice", "on_settings_update")
+        else:
+            raise ValueError("unknown stand-in event " + repr(name))
+    
+    # IDiscordCore
+    
+    def destroy(self, core):
+        if self in cores:
+            cores.remove(self)
+    
+    def run_callbacks(self, core):
+        self.ticks += 1
+        for name, rate in config.rates.items():
+            credit = self._credit.get(name, 0.0) + rate
+            count = int(credit)
+            self._credit[name] = credit - count
+            for _ in range(count):
+                self._Synthesize(name)
+        
+        pending, self.pending = self.pending, []
+        for callback, args in pending:
+            callback(*args)
+        
+        return Result.Ok
+    
+    def set_log_hook(self, core, min_level, hook_data, hook):
+        self.logHook = (min_level, hook_data, hook)
+    
+    def get_application_manager(self, core):
+        return self.tables["application"]
+    
+    def get_user_manager(self, core):
+        return self.tables["user"]
+    
+    def get_image_manager(self, core):
+        return self.tables["image"]
+    
+    def get_activity_manager(self, core):
+        return self.tables["activity"]
+    
+    def get_relationship_manager(self, core):
+        return self.tables["relationship"]
+    
+    def get_lobby_manager(self, core):
+        return self.tables["lobby"]
+    
+    def get_network_manager(self, core):
+        return self.tables["network"]
+    
+    def get_overlay_manager(self, core):
+        return self.tables["overlay"]
+    
+    def get_storage_manager(self, core):
+        return self.tables["storage"]
+    
+    def get_store_manager(self, core):
+        return self.tables["store"]
+    
+    def get_voice_manager(self, core):
+        return self.tables["voice"]
+    
+    def get_achievement_manager(self, core):
+        return self.tables["achievement"]
+
+def _create(version, params, core):
+    standIn = StandInCore(params.contents)
+    cores.append(standIn)
+    core[0] = pointer(standIn.table)
+    return Result.Ok
+
+DiscordCreate = CFUNCTYPE(c_int32, sdk.DiscordVersion, POINTER(sdk.DiscordCreateParams), POINTER(POINTER(sdk.IDiscordCore)))(_create)
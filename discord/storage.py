@@ -2,13 +2,15 @@ from . import sdk
 from .enum import Result
 from .exception import getException
 from .model import FileStat
+from .callback import bindCallback
+from .buffer import bufferPointer
+from .arrays import collect
 from typing import Callable, Optional
 import ctypes
 
 class StorageManager:
     def __init__(self):
         self._internal = None
-        self._garbage = []
         self._events = None
         
     def GetPath(self) -> str:
@@ -42,7 +44,7 @@ class StorageManager:
         if read.value != fileSize:
             print("discord/storage.py: warning: attempting to read " + str(fileSize) + " bytes, but read " + str(read.value))
             
-        return bytes(buffer[:read.value])
+        return ctypes.string_at(buffer, read.value)
             
     def ReadAsync(self, name: str, callback: Callable[[Result, Optional[bytes]], None]) -> None:
         """
@@ -50,48 +52,46 @@ class StorageManager:
         
         Returns discord.enum.Result (int) and data (bytes) via callback.
         """
-        def CCallback(callback_data, result, data, data_length):
-            self._garbage.remove(CCallback)
+        def CCallback(result, data, data_length):
             result = Result(result)
             if result == Result.Ok:
-                data = bytes(data[:data_length])
+                data = ctypes.string_at(data, data_length)
                 callback(result, data)
             else:
                 callback(result, None)
                 
-        CCallback = self._internal.read_async.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.read_async.argtypes[-1], CCallback)
         
         name = ctypes.c_char_p(name.encode("utf8"))
-        self._internal.read_async(self._internal, name, ctypes.c_void_p(), CCallback)
+        self._internal.read_async(self._internal, name, callbackData, CCallback)
         
     def ReadAsyncPartial(self, name: str, offset: int, length: int, callback: Callable[[Result], None]) -> None:
         """
         Reads data asynchronously from the game's allocated save file, starting at a given offset and up to a given length.
         """
-        def CCallback(callback_data, result, data, data_length):
-            self._garbage.remove(CCallback)
+        def CCallback(result, data, data_length):
             result = Result(result)
             if result == Result.Ok:
-                data = bytes(data[:data_length])
+                data = ctypes.string_at(data, data_length)
                 callback(result, data)
             else:
                 callback(result, None)
                 
-        CCallback = self._internal.read_async.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.read_async.argtypes[-1], CCallback)
         
         name = ctypes.c_char_p(name.encode("utf8"))
-        self._internal.read_async_partial(self._internal, name, offset, length, ctypes.c_void_p(), CCallback)
+        self._internal.read_async_partial(self._internal, name, offset, length, callbackData, CCallback)
         
     def Write(self, name: str, data: bytes) -> None:
         """
         Writes data synchronously to disk, under the given key name.
+        
+        Accepts bytes, bytearray, memoryview or any other buffer.
         """
         name = ctypes.c_char_p(name.encode("utf8"))
-        data = (ctypes.c_uint8 * len(data))(*data)
+        buffer, length = bufferPointer(data)
         
-        result = Result(self._internal.write(self._internal, name, data, len(data)))
+        result = Result(self._internal.write(self._internal, name, buffer, length))
         if result != Result.Ok:
             raise getException(result)
         
@@ -99,18 +99,16 @@ class StorageManager:
         """
         Writes data asynchronously to disk under the given keyname.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.write_async.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.write_async.argtypes[-1], CCallback)
         
         name = ctypes.c_char_p(name.encode("utf8"))
-        data = (ctypes.c_uint8 * len(data))(*data)
+        buffer, length = bufferPointer(data)
         
-        self._internal.write_async(self._internal, name, data, len(data), ctypes.c_void_p(), CCallback)
+        self._internal.write_async(self._internal, name, buffer, length, callbackData, CCallback)
         
     def Delete(self, name: str) -> None:
         """
@@ -166,4 +164,47 @@ class StorageManager:
         if result != Result.Ok:
             raise getException(result)
         
-        return FileStat(internal = stat)
\ No newline at end of file
+        return FileStat(internal = stat)
+    
+    def IterFileStats(self):
+        """
+        Iterates over the file info of every file.
+        
+        One model is reused for every item, it changes on the next step: call Detach() on it to keep it.
+        """
+        internal = self._internal
+        getAt = internal.stat_at
+        record = sdk.DiscordFileStat()
+        model = FileStat(internal = record)
+        for index in range(self.Count()):
+            result = getAt(internal, index, record)
+            if result != Result.Ok:
+                raise getException(Result(result))
+                
+            model._Invalidate()
+            yield model
+            
+    def AllFileStats(self) -> list:
+        """
+        Returns the file info of every file, read into a single array.
+        """
+        internal = self._internal
+        getAt = internal.stat_at
+        records = (sdk.DiscordFileStat * self.Count())()
+        for index in range(len(records)):
+            result = getAt(internal, index, records[index])
+            if result != Result.Ok:
+                raise getException(Result(result))
+                
+        return [FileStat(internal = record) for record in records]
+        
+    def ToArray(self) -> "numpy.ndarray":
+        """
+        Returns the file info of every file as a NumPy structured array (requires numpy).
+        """
+        def fill(index, record):
+            result = Result(self._internal.stat_at(self._internal, index, record))
+            if result != Result.Ok:
+                raise getException(result)
+                
+        return collect(sdk.DiscordFileStat, self.Count(), fill)
\ No newline at end of file
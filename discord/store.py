@@ -3,39 +3,53 @@ from .enum import Result
 from .model import Sku, Entitlement
 from .event import bindEvents
 from .exception import getException
+from .callback import bindCallback
+from .arrays import collect
 from typing import Callable
 import ctypes
 
 class StoreManager:
     def __init__(self):
         self._internal = None
-        self._garbage = []
+        self._views = False
         self._events = bindEvents(sdk.IDiscordStoreEvents,
             self._OnEntitlementCreate,
             self._OnEntitlementDelete
         )
         
     def _OnEntitlementCreate(self, event_data, entitlement):
-        self.OnEntitlementCreate(Entitlement(copy = entitlement))
+        if self._views:
+            self.OnEntitlementCreate(Entitlement(internal = entitlement.contents))
+        else:
+            self.OnEntitlementCreate(Entitlement(copy = entitlement.contents))
         
     def _OnEntitlementDelete(self, event_data, entitlement):
-        self.OnEntitlementDelete(Entitlement(copy = entitlement))
+        if self._views:
+            self.OnEntitlementDelete(Entitlement(internal = entitlement.contents))
+        else:
+            self.OnEntitlementDelete(Entitlement(copy = entitlement.contents))
     
+    def SetEventViews(self, enabled: bool) -> None:
+        """
+        Makes OnEntitlementCreate and OnEntitlementDelete receive models backed by the SDK's memory instead of copies.
+        
+        They are only valid until the handler returns: call Detach() on them to keep them.
+        """
+        self._views = enabled
+        
     def FetchSkus(self, callback: Callable[[Result], None]) -> None:
         """
         Fetches the list of SKUs for the connected application, readying them for iteration.
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.fetch_skus.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.fetch_skus.argtypes[-1], CCallback)
         
-        self._internal.fetch_skus(self._internal, ctypes.c_void_p(), CCallback)
+        self._internal.fetch_skus(self._internal, callbackData, CCallback)
         
     def CountSkus(self) -> int:
         """
@@ -51,7 +65,7 @@ class StoreManager:
         """
         sku = sdk.DiscordSku()
         
-        result = Result(self._internal.get_sku(skuId, sku))
+        result = Result(self._internal.get_sku(self._internal, skuId, sku))
         if result != Result.Ok:
             raise getException(result)
             
@@ -63,27 +77,68 @@ class StoreManager:
         """
         sku = sdk.DiscordSku()
         
-        result = Result(self._internal.get_sku_at(index, sku))
+        result = Result(self._internal.get_sku_at(self._internal, index, sku))
         if result != Result.Ok:
             raise getException(result)
             
         return Sku(internal = sku)
         
+    def IterSkus(self):
+        """
+        Iterates over the SKUs readied by FetchSkus().
+        
+        One model is reused for every item, it changes on the next step: call Detach() on it to keep it.
+        """
+        internal = self._internal
+        getAt = internal.get_sku_at
+        record = sdk.DiscordSku()
+        model = Sku(internal = record)
+        for index in range(self.CountSkus()):
+            result = getAt(internal, index, record)
+            if result != Result.Ok:
+                raise getException(Result(result))
+                
+            model._Invalidate()
+            yield model
+            
+    def AllSkus(self) -> list:
+        """
+        Returns the SKUs readied by FetchSkus(), read into a single array.
+        """
+        internal = self._internal
+        getAt = internal.get_sku_at
+        records = (sdk.DiscordSku * self.CountSkus())()
+        for index in range(len(records)):
+            result = getAt(internal, index, records[index])
+            if result != Result.Ok:
+                raise getException(Result(result))
+                
+        return [Sku(internal = record) for record in records]
+        
+    def SkusToArray(self) -> "numpy.ndarray":
+        """
+        Returns the SKUs readied by FetchSkus() as a NumPy structured array (requires numpy).
+        """
+        def fill(index, record):
+            result = Result(self._internal.get_sku_at(self._internal, index, record))
+            if result != Result.Ok:
+                raise getException(result)
+                
+        return collect(sdk.DiscordSku, self.CountSkus(), fill)
+        
     def FetchEntitlements(self, callback: Callable[[Result], None]) -> None:
         """
         Fetches a list of entitlements to which the user is entitled.
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.fetch_entitlements.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.fetch_entitlements.argtypes[-1], CCallback)
         
-        self._internal.fetch_entitlements(self._internal, ctypes.c_void_p(), CCallback)
+        self._internal.fetch_entitlements(self._internal, callbackData, CCallback)
         
     def CountEntitlements(self) -> int:
         """
@@ -99,11 +154,11 @@ class StoreManager:
         """
         entitlement = sdk.DiscordEntitlement()
         
-        result = Result(self._internal.get_entitlement(entitlementId, entitlement))
+        result = Result(self._internal.get_entitlement(self._internal, entitlementId, entitlement))
         if result != Result.Ok:
             raise getException(result)
             
-        return Entitlement(internal = sku)
+        return Entitlement(internal = entitlement)
         
     def GetEntitlementAt(self, index: int) -> Entitlement:
         """
@@ -111,11 +166,54 @@ class StoreManager:
         """
         entitlement = sdk.DiscordEntitlement()
         
-        result = Result(self._internal.get_entitlement_at(index, entitlement))
+        result = Result(self._internal.get_entitlement_at(self._internal, index, entitlement))
         if result != Result.Ok:
             raise getException(result)
             
-        return Entitlement(internal = sku)
+        return Entitlement(internal = entitlement)
+        
+    def IterEntitlements(self):
+        """
+        Iterates over the entitlements readied by FetchEntitlements().
+        
+        One model is reused for every item, it changes on the next step: call Detach() on it to keep it.
+        """
+        internal = self._internal
+        getAt = internal.get_entitlement_at
+        record = sdk.DiscordEntitlement()
+        model = Entitlement(internal = record)
+        for index in range(self.CountEntitlements()):
+            result = getAt(internal, index, record)
+            if result != Result.Ok:
+                raise getException(Result(result))
+                
+            model._Invalidate()
+            yield model
+            
+    def AllEntitlements(self) -> list:
+        """
+        Returns the entitlements readied by FetchEntitlements(), read into a single array.
+        """
+        internal = self._internal
+        getAt = internal.get_entitlement_at
+        records = (sdk.DiscordEntitlement * self.CountEntitlements())()
+        for index in range(len(records)):
+            result = getAt(internal, index, records[index])
+            if result != Result.Ok:
+                raise getException(Result(result))
+                
+        return [Entitlement(internal = record) for record in records]
+        
+    def EntitlementsToArray(self) -> "numpy.ndarray":
+        """
+        Returns the entitlements readied by FetchEntitlements() as a NumPy structured array (requires numpy).
+        """
+        def fill(index, record):
+            result = Result(self._internal.get_entitlement_at(self._internal, index, record))
+            if result != Result.Ok:
+                raise getException(result)
+                
+        return collect(sdk.DiscordEntitlement, self.CountEntitlements(), fill)
         
     def HasSkuEntitlement(self, skuId: int) -> bool:
         """
@@ -123,7 +221,7 @@ class StoreManager:
         """
         has_entitlement = ctypes.c_bool()
         
-        result = Result(self._internal.has_sku_entitlement(skuId, has_entitlement))
+        result = Result(self._internal.has_sku_entitlement(self._internal, skuId, has_entitlement))
         if result != Result.Ok:
             raise getException(result)
             
@@ -135,15 +233,13 @@ class StoreManager:
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.start_purchase.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.start_purchase.argtypes[-1], CCallback)
         
-        self._internal.start_purchase(self._internal, skuId, ctypes.c_void_p(), CCallback)
+        self._internal.start_purchase(self._internal, skuId, callbackData, CCallback)
         
     def OnEntitlementCreate(self, entitlement: Entitlement) -> None:
         """
@@ -0,0 +1,131 @@
+from .pump import CallbackPump
+from .enum import Result
+from .exception import getException
+from .callback import callbackIndex, callWithErrors
+from concurrent.futures import Future
+
+class ManagerProxy:
+    """
+    Forwards every method call of a manager to the pump thread.
+    
+    Each call returns a concurrent.futures.Future. Methods taking a callback
+    may be called without it: the future then resolves to the callback's value,
+    or to the exception matching a failed Result.
+    
+    Objects returned by the manager (transactions, search queries) are not
+    proxied: use ThreadSafeDiscord.Submit to call their methods.
+    """
+    def __init__(self, pump: CallbackPump, manager):
+        object.__setattr__(self, "_pump", pump)
+        object.__setattr__(self, "_manager", manager)
+    
+    def __getattr__(self, key):
+        method = getattr(self._manager, key)
+        if key.startswith("_") or not callable(method):
+            return method
+        
+        index = callbackIndex(method)
+        pump = self._pump
+        
+        def call(*args) -> Future:
+            if index is None or len(args) != index:
+                return pump.Submit(method, *args)
+            
+            future = Future()
+            pump._Track(future)
+            
+            def callback(result, *value):
+                result = Result(result)
+                if result != Result.Ok:
+                    future.set_exception(getException(result))
+                else:
+                    future.set_result(value[0] if value else None)
+            
+            def fail(exception):
+                # raised while the callback ran: the future would never resolve otherwise
+                if not future.done():
+                    future.set_exception(exception)
+            
+            def command():
+                if not future.set_running_or_notify_cancel():
+                    return
+                
+                try:
+                    callWithErrors(fail, method, *args, callback)
+                except BaseException as exception:
+                    future.set_exception(exception)
+            
+            pump.Queue(command)
+            return future
+        
+        # we cache the wrapper, __getattr__ won't be called again for this key
+        object.__setattr__(self, key, call)
+        return call
+    
+    def __setattr__(self, key, value):
+        # event handlers (OnLobbyUpdate...) are set on the manager, they run on the pump thread
+        setattr(self._manager, key, value)
+    
+    def __dir__(self):
+        return dir(self._manager)
+
+class ThreadSafeDiscord:
+    """
+    Facade over a Discord instance which can be used from any thread.
+    
+    Calls are queued onto the pump thread and run in batches before each RunCallbacks.
+    """
+    def __init__(self, discord, pump: CallbackPump):
+        self._discord = discord
+        self._pump = pump
+        self._proxies = {}
+    
+    def _GetProxy(self, getter) -> ManagerProxy:
+        proxy = self._proxies.get(getter)
+        if proxy is None:
+            manager = self._pump.Submit(getattr(self._discord, getter)).result()
+            proxy = self._proxies.setdefault(getter, ManagerProxy(self._pump, manager))
+        
+        return proxy
+    
+    def Submit(self, func, *args) -> Future:
+        """
+        Runs an arbitrary call on the pump thread.
+        """
+        return self._pump.Submit(func, *args)
+    
+    def GetActivityManager(self) -> ManagerProxy:
+        return self._GetProxy("GetActivityManager")
+    
+    def GetRelationshipManager(self) -> ManagerProxy:
+        return self._GetProxy("GetRelationshipManager")
+    
+    def GetImageManager(self) -> ManagerProxy:
+        return self._GetProxy("GetImageManager")
+    
+    def GetUserManager(self) -> ManagerProxy:
+        return self._GetProxy("GetUserManager")
+    
+    def GetLobbyManager(self) -> ManagerProxy:
+        return self._GetProxy("GetLobbyManager")
+    
+    def GetNetworkManager(self) -> ManagerProxy:
+        return self._GetProxy("GetNetworkManager")
+    
+    def GetOverlayManager(self) -> ManagerProxy:
+        return self._GetProxy("GetOverlayManager")
+    
+    def GetApplicationManager(self) -> ManagerProxy:
+        return self._GetProxy("GetApplicationManager")
+    
+    def GetStorageManager(self) -> ManagerProxy:
+        return self._GetProxy("GetStorageManager")
+    
+    def GetStoreManager(self) -> ManagerProxy:
+        return self._GetProxy("GetStoreManager")
+    
+    def GetVoiceManager(self) -> ManagerProxy:
+        return self._GetProxy("GetVoiceManager")
+    
+    def GetAchievementManager(self) -> ManagerProxy:
+        return self._GetProxy("GetAchievementManager")
@@ -3,13 +3,13 @@ from .model import User
 from .enum import Result, PremiumType, UserFlag
 from .event import bindEvents
 from .exception import getException
+from .callback import bindCallback
 from typing import Callable, Optional
 import ctypes
 
 class UserManager:
     def __init__(self):
         self._internal = None
-        self._garbage = []
         self._events = bindEvents(sdk.IDiscordUserEvents,
             self._OnCurrentUserUpdate
         )
@@ -34,18 +34,16 @@ class UserManager:
         
         Returns discord.enum.Result (int) and User via callback.
         """
-        def CCallback(callback_data, result, user):
-            self._garbage.remove(CCallback)
+        def CCallback(result, user):
             result = Result(result)
             if result == Result.Ok:
                 callback(result, User(copy = user.contents))
             else:
                 callback(result, None)
                 
-        CCallback = self._internal.get_user.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.get_user.argtypes[-1], CCallback)
         
-        self._internal.get_user(self._internal, userId, ctypes.c_void_p(), CCallback)
+        self._internal.get_user(self._internal, userId, callbackData, CCallback)
         
     def GetCurrentUserPremiumType(self) -> PremiumType:
         """
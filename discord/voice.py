@@ -3,13 +3,13 @@ from .model import InputMode
 from .enum import Result
 from .event import bindEvents
 from .exception import getException
+from .callback import bindCallback
 from typing import Callable
 import ctypes
 
 class VoiceManager:
     def __init__(self):
         self._internal = None
-        self._garbage = []
         self._events = bindEvents(sdk.IDiscordVoiceEvents,
             self._OnSettingsUpdate
         )
@@ -34,15 +34,13 @@ class VoiceManager:
         
         Returns discord.enum.Result (int) via callback.
         """
-        def CCallback(callback_data, result):
-            self._garbage.remove(CCallback)
+        def CCallback(result):
             result = Result(result)
             callback(result)
             
-        CCallback = self._internal.set_input_mode.argtypes[-1](CCallback)
-        self._garbage.append(CCallback) # prevent it from being garbage collected
+        callbackData, CCallback = bindCallback(self._internal.set_input_mode.argtypes[-1], CCallback)
         
-        self._internal.set_input_mode(self._internal, inputMode._internal, ctypes.c_void_p(), CCallback)
+        self._internal.set_input_mode(self._internal, inputMode._internal, callbackData, CCallback)
         
     def IsSelfMute(self) -> bool:
         """
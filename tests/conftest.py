@@ -0,0 +1,21 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord
+from discord import sdk, standin
+import pytest
+
+# the tests run against the pure-Python stand-in core
+sdk.LoadLibrary("standin")
+
+@pytest.fixture
+def app():
+    instance = discord.Discord(0, discord.CreateFlags.Default)
+    yield instance
+    del instance
+
+@pytest.fixture
+def core(app):
+    return standin.cores[-1]
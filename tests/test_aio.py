@@ -0,0 +1,41 @@
+from discord.aio import AsyncDiscord
+import asyncio
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def test_event_handler_set_through_wrapper(app):
+    received = []
+    
+    async def main():
+        async with AsyncDiscord(app) as client:
+            client.lobbies.OnLobbyMessage = lambda lobbyId, userId, message: received.append((lobbyId, message))
+            await client.lobbies.send_lobby_message(1, "hello")
+            while not received:
+                await asyncio.sleep(0.01)
+    
+    run(asyncio.wait_for(main(), 5))
+    assert received == [(1, "hello")]
+    assert app.GetLobbyManager().OnLobbyMessage is not None
+
+def test_get_ticket(app):
+    async def main():
+        async with AsyncDiscord(app) as client:
+            return await client.applications.get_ticket()
+    
+    assert run(asyncio.wait_for(main(), 5)) == "standin-ticket"
+
+def test_callback_error_fails_future(app):
+    manager = app.GetApplicationManager()
+    manager.GetOAuth2Token = lambda callback: manager.GetTicket(lambda result, ticket: callback(result, ticket.missing))
+    
+    async def main():
+        async with AsyncDiscord(app) as client:
+            return await client.applications.get_oauth2_token()
+    
+    try:
+        run(asyncio.wait_for(main(), 5))
+    except AttributeError:
+        pass
+    else:
+        assert False, "expected the callback's AttributeError"
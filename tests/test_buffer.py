@@ -0,0 +1,50 @@
+from discord.buffer import BufferPool
+import ctypes
+import pytest
+
+def borrow(pool, data):
+    source = (ctypes.c_uint8 * len(data)).from_buffer_copy(data)
+    return pool.Borrow(source, len(data))
+
+def test_buffer_reused_when_released():
+    pool = BufferPool(16)
+    view = borrow(pool, b"abc")
+    assert bytes(view) == b"abc"
+    pool.Return(view)
+    
+    view = borrow(pool, b"de")
+    assert bytes(view) == b"de"
+    pool.Return(view)
+    assert len(pool._free) == 1
+
+def test_kept_views_are_not_overwritten():
+    pool = BufferPool(16)
+    view = borrow(pool, b"\x01\x01\x01")
+    kept = [memoryview(view), view[1:]]
+    pool.Return(view)
+    
+    pool.Return(borrow(pool, b"\x09\x09\x09"))
+    assert [bytes(item) for item in kept] == [b"\x01\x01\x01", b"\x01\x01"]
+
+def test_kept_arrays_are_not_overwritten():
+    numpy = pytest.importorskip("numpy")
+    pool = BufferPool(16)
+    view = borrow(pool, b"\x01\x01\x01")
+    kept = numpy.frombuffer(view, dtype = numpy.uint8)
+    pool.Return(view)
+    
+    pool.Return(borrow(pool, b"\x09\x09\x09"))
+    assert kept.tolist() == [1, 1, 1]
+
+def test_kept_message_survives_the_next_one(app, core):
+    network = app.GetNetworkManager()
+    network.SetMessageViews(True)
+    kept = []
+    network.OnMessage = lambda peerId, channelId, data: kept.append(memoryview(data))
+    
+    for message in (b"\x01\x01\x01", b"\x09\x09\x09"):
+        data = (ctypes.c_uint8 * len(message)).from_buffer_copy(message)
+        core.Emit("network", "on_message", 2, 0, data, len(data))
+        app.RunCallbacks()
+    
+    assert [bytes(item) for item in kept] == [b"\x01\x01\x01", b"\x09\x09\x09"]
@@ -0,0 +1,85 @@
+from discord.model import ImageHandle
+from discord.enum import ImageType, Result
+
+def handle(id, size = 16):
+    model = ImageHandle()
+    model.Type = ImageType.User
+    model.Id = id
+    model.Size = size
+    return model
+
+def fetch(app, manager, handle, refresh = False):
+    results = []
+    manager.Fetch(handle, refresh, lambda result, fetched: results.append((result, fetched)))
+    while not results:
+        app.RunCallbacks()
+    
+    return results[0]
+
+def test_cached_view_outlives_eviction(app):
+    manager = app.GetImageManager()
+    cache = manager.EnableCache(16 * 16 * 4)
+    _, first = fetch(app, manager, handle(1))
+    _, second = fetch(app, manager, handle(2))
+    
+    data = manager.GetData(first)
+    expected = bytes(data)
+    manager.GetData(second)
+    assert len(cache) == 1 and bytes(data) == expected
+    assert isinstance(data, memoryview) and data.readonly
+
+def test_fetch_many_records_raising_fetches(app):
+    from discord.exception import NotFound
+    manager = app.GetImageManager()
+    fetch = manager.Fetch
+    
+    def Fetch(handle, refresh, callback):
+        if handle.Id % 3 == 0:
+            raise NotFound("result 3") if handle.Id else RuntimeError("gone")
+        
+        fetch(handle, refresh, callback)
+    
+    manager.Fetch = Fetch
+    done = []
+    manager.FetchMany([handle(id) for id in range(10)], False, done.append, maxInFlight = 2)
+    while not done:
+        app.RunCallbacks()
+    
+    results = [result for result, _ in done[0]]
+    assert results[0] == Result.InternalError
+    assert results[3] == results[6] == results[9] == Result.NotFound
+    assert results.count(Result.Ok) == 6
+    assert len(done) == 1
+
+def test_disk_cache_recovers_truncated_files(tmp_path):
+    from discord.image import ImageDiskCache
+    import pytest
+    
+    path = str(tmp_path / "avatars")
+    cache = ImageDiskCache(path)
+    cache.Put((1, 1, 16), 16, 16, bytes(range(256)) * 4)
+    cache.Put((1, 2, 16), 16, 16, bytes(1024))
+    cache.Close()
+    full = open(path, "rb").read()
+    
+    # cut inside the last record's pixels, then inside its header: the first record is kept
+    for cut in (len(full) - 100, len(full) - 1024 - 10):
+        open(path, "wb").write(full[:cut])
+        cache = ImageDiskCache(path)
+        assert len(cache) == 1 and bytes(cache.Get((1, 1, 16))[2]) == bytes(range(256)) * 4
+        cache.Put((1, 2, 16), 16, 16, bytes(1024))
+        assert (1, 2, 16) in cache
+        cache.Close()
+        assert ImageDiskCache(path).Peek((1, 2, 16)) == (16, 16)
+    
+    # cut inside the file header
+    open(path, "wb").write(full[:3])
+    cache = ImageDiskCache(path)
+    assert len(cache) == 0
+    cache.Put((1, 1, 16), 16, 16, bytes(1024))
+    cache.Close()
+    assert len(ImageDiskCache(path)) == 1
+    
+    open(path, "wb").write(b"not a cache")
+    with pytest.raises(ValueError):
+        ImageDiskCache(path)
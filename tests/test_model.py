@@ -0,0 +1,17 @@
+from discord.model import User
+import pytest
+
+def user(id):
+    model = User()
+    model.Id = id
+    model.Username = "user" + str(id)
+    return model
+
+def test_pack_many_round_trip():
+    users = [user(1), user(2)]
+    assert User.UnpackMany(User.PackMany(users)) == users
+
+def test_unpack_many_rejects_partial_records():
+    data = User.PackMany([user(1), user(2)])
+    with pytest.raises(ValueError):
+        User.UnpackMany(data[:-1])
@@ -0,0 +1,33 @@
+import pytest
+
+class Failure(Exception):
+    pass
+
+def test_pump_error_is_reported(app):
+    manager = app.GetApplicationManager()
+    proxy = app.GetThreadSafe().GetApplicationManager()
+    original = app.RunCallbacks
+    getTicket = manager.GetTicket
+    
+    def runCallbacks():
+        raise Failure()
+    
+    def GetTicket(callback):
+        # the tick asking for the ticket fails before its callback runs
+        getTicket(callback)
+        app.RunCallbacks = runCallbacks
+    
+    manager.GetTicket = GetTicket
+    future = proxy.GetTicket()
+    assert isinstance(future.exception(5), Failure)
+    
+    app._pump._thread.join(5)
+    with pytest.raises(Failure):
+        app.StartPump()
+    
+    manager.GetTicket = getTicket
+    app.RunCallbacks = original
+    try:
+        assert app.GetThreadSafe().GetApplicationManager().GetTicket().result(5) == "standin-ticket"
+    finally:
+        app.StopPump()
@@ -0,0 +1,23 @@
+from discord.enum import RelationshipType
+
+def test_index_returns_copies(app):
+    manager = app.GetRelationshipManager()
+    index = manager.EnableIndex()
+    relationship = next(iter(index))
+    userId = relationship.User.Id
+    type = relationship.Type
+    changed = RelationshipType.Friend if type != RelationshipType.Friend else RelationshipType.Blocked
+    
+    relationship.User.Id = -1
+    relationship.Type = changed
+    index.Get(userId).Type = changed
+    
+    assert index.Get(userId).Type == type
+    assert index.GetByType(type)
+    assert -1 not in index
+    
+    # an update still replaces the original entry
+    update = index.Get(userId)
+    update.Type = RelationshipType.None_
+    index._Put(update)
+    assert userId not in index
@@ -0,0 +1,50 @@
+from discord import CreateFlags
+from discord.remote import RemoteDiscord
+import time
+import pytest
+
+@pytest.fixture
+def remote():
+    instance = RemoteDiscord(0, CreateFlags.Default, rate = 200)
+    yield instance
+    instance.Close()
+
+def pump(remote, condition):
+    deadline = time.time() + 5
+    while not condition() and time.time() < deadline:
+        remote.RunCallbacks()
+        time.sleep(0.01)
+
+def test_events_keep_their_order_across_sync_calls(remote):
+    lobbies = remote.GetLobbyManager()
+    relationships = remote.GetRelationshipManager()
+    received = []
+    
+    def OnLobbyMessage(lobbyId, userId, message):
+        received.append(int(message))
+        if message == "0":
+            for index in range(100, 103):
+                lobbies.SendLobbyMessage(1, str(index), lambda result: None)
+            
+            # the events already received are set aside while waiting for the reply
+            relationships.Count()
+            # and the newer ones reach the ring before the handler returns
+            time.sleep(0.2)
+    
+    lobbies.OnLobbyMessage = OnLobbyMessage
+    for index in range(5):
+        lobbies.SendLobbyMessage(1, str(index), lambda result: None)
+    
+    time.sleep(0.3)
+    pump(remote, lambda: len(received) == 8)
+    assert received == [0, 1, 2, 3, 4, 100, 101, 102]
+
+def test_message_views_are_forwarded_as_bytes(remote):
+    network = remote.GetNetworkManager()
+    network.SetMessageViews(True)
+    received = []
+    network.OnMessage = lambda peerId, channelId, data: received.append(data)
+    network.SendMessage(2, 0, b"ping")
+    
+    pump(remote, lambda: received)
+    assert received == [b"ping"]
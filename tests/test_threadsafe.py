@@ -0,0 +1,12 @@
+def test_callback_error_fails_future(app):
+    app.StartPump(10, 100)
+    try:
+        proxy = app.GetThreadSafe().GetApplicationManager()
+        assert proxy.GetTicket().result(5) == "standin-ticket"
+        
+        manager = app.GetApplicationManager()
+        manager.GetOAuth2Token = lambda callback: manager.GetTicket(lambda result, ticket: callback(result, ticket.missing))
+        exception = proxy.GetOAuth2Token().exception(5)
+        assert isinstance(exception, AttributeError)
+    finally:
+        app.StopPump()